@@ -0,0 +1,192 @@
+"""
+Performance benchmarks of plotting-gui.py
+
+Synthetic data folders are generated in a temporary directory and the main code paths are timed
+headless (offscreen Qt platform):
+    - UpdateTree (scanning the folder)
+    - readData (cold: parsing, warm: cache) until the data is loaded
+    - Update (complete rebuild of the figure incl. drawing) and canvas.draw
+    - scenarios: drag & drop of a file into a subplot, switching the theme
+
+The results are written as JSON to compare versions:
+    python benchmarks/benchmark.py --scales 10x1000 100x10000 --output results.json
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+
+from PyQt5 import QtCore, QtWidgets
+
+
+def loadApplication():
+    """
+    imports plotting-gui.py as module (file name is not importable)
+    """
+    path = Path(__file__).resolve().parent.parent / "plotting-gui.py"
+    spec = importlib.util.spec_from_file_location("plotting_gui", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def generateData(root, nfiles, nrows, nfolders=1, delimiter=",", seed=0):
+    """
+    writes nfiles synthetic chromatograms (x, y) with nrows rows, distributed over nfolders subfolders
+    returns list of files
+    """
+    rng = np.random.default_rng(seed)
+    x = np.linspace(0, 30, nrows)
+    files = []
+    for i in range(nfiles):
+        folder = Path(root, f"folder{i % nfolders:03d}")
+        folder.mkdir(parents=True, exist_ok=True)
+
+        y = rng.normal(0, 0.01, nrows)
+        for position, height in zip(rng.uniform(1, 29, 5), rng.uniform(0.2, 1, 5)):
+            y += height * np.exp(-(x - position)**2 / 0.02)
+
+        files.append(folder / f"run{i:05d}.csv")
+        np.savetxt(files[-1], np.c_[x, y], delimiter=delimiter, header=f"time{delimiter}signal", comments="",
+                   fmt="%.6g")
+    return files
+
+
+def waitFor(predicate, timeout=600):
+    """
+    processes Qt events until predicate() is true
+    """
+    end = time.perf_counter() + timeout
+    while not predicate():
+        if time.perf_counter() > end:
+            raise TimeoutError
+        QtWidgets.QApplication.processEvents(QtCore.QEventLoop.AllEvents, 10)
+
+
+def timeit(function, repeat):
+    """
+    runs function repeat times, returns list of durations (s)
+    """
+    durations = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def setSubplots(window, files):
+    """
+    puts files into the first subplot (like drag & drop) and waits for the plot
+    """
+    window.filedict.update({i.stem: i for i in files})
+    window.subplotList[0].clear()
+    window.subplotList[0].addItems([i.stem for i in files])
+    window.scheduler.flush()
+    waitFor(lambda: window.loadjob is None and not window.scheduler.timer.isActive())
+
+
+def benchmarkScale(pg, root, nfiles, nrows, repeat):
+    """
+    runs all benchmarks for one data size, returns list of results
+    """
+    files = generateData(root, nfiles, nrows, nfolders=max(nfiles // 10, 1))
+    window = pg.ApplicationWindow()
+    window.diskcache.enabled = False
+    # draw in the GUI thread to time the complete draw (not the persisted setting of asyncAct)
+    window.createCanvas().asyncrender = False
+    results = []
+
+    def record(name, durations):
+        results.append({"name": name, "files": nfiles, "rows": nrows, "seconds": durations,
+                        "median": statistics.median(durations)})
+
+    def scan():
+        window.folderpath = str(root)
+        window.UpdateTree()
+        waitFor(lambda: window.scanjob is None)
+
+    record("UpdateTree", timeit(scan, repeat))
+
+    def readData(cold):
+        if cold:
+            window.cache.clear()
+        window.readData()
+        waitFor(lambda: window.loadjob is None)
+
+    window.filedict = {i.stem: i for i in files}
+    window.filelistoflist = [files]
+    record("readData (cold)", timeit(lambda: readData(True), repeat))
+    record("readData (warm)", timeit(lambda: readData(False), repeat))
+
+    def update():
+        window.dirty = {"theme"}
+        window.Update()
+
+    record("Update", timeit(update, repeat))
+    record("canvas.draw", timeit(window.canv.draw, repeat))
+
+    # scenarios
+    setSubplots(window, files[:-1])
+
+    def dragFile():
+        window.subplotList[0].addItem(files[-1].stem)
+        waitFor(lambda: len(window.canv.lines) == len(files) and window.loadjob is None
+                and not window.scheduler.timer.isActive())
+        window.subplotList[0].takeItem(window.subplotList[0].count() - 1)
+        waitFor(lambda: len(window.canv.lines) == len(files) - 1 and window.loadjob is None
+                and not window.scheduler.timer.isActive())
+
+    record("scenario: drag file into subplot and remove it", timeit(dragFile, repeat))
+
+    def switchTheme():
+        for theme in ("ggplot", "default"):
+            window.ThemeBox.setCurrentText(theme)
+            window.scheduler.flush()
+
+    record("scenario: switch theme twice", timeit(switchTheme, repeat))
+
+    window.close()
+    window.deleteLater()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", nargs="+", default=["10x1000", "50x10000", "100x100000"],
+                        help="data sizes as FILESxROWS")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default="benchmark.json", help="JSON file with results")
+    args = parser.parse_args(argv)
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+    pg = loadApplication()
+
+    results = []
+    for scale in args.scales:
+        nfiles, nrows = (int(i) for i in scale.lower().split("x"))
+        with tempfile.TemporaryDirectory() as root:
+            for result in benchmarkScale(pg, Path(root), nfiles, nrows, args.repeat):
+                print(f"{nfiles:>6} files x {nrows:>8} rows  {result['name']:<50} {result['median'] * 1000:10.1f} ms")
+                results.append(result)
+
+    report = {"version": pg.__version__, "python": platform.python_version(), "platform": platform.platform(),
+              "numpy": np.__version__, "matplotlib": pg.mpl.__version__, "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+              "repeat": args.repeat, "results": results}
+    Path(args.output).write_text(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,25 +6,157 @@ https://matplotlib.org/stable/gallery/user_interfaces/embedding_in_qt_sgskip
 https://pyshine.com/Make-GUI-With-Matplotlib-And-PyQt5/
 """
 
+import time
+# start of the application (see --profile-startup)
+STARTUP = time.perf_counter()
+
 import sys
 import os
+import argparse
+import concurrent.futures
+import io
+import cProfile
+import contextlib
+import importlib
+import warnings
+import threading
+import hashlib
+import json
+import pickle
+import re
+import weakref
+from collections import OrderedDict, namedtuple
+from pathlib import Path
 
-import matplotlib as mpl
-import matplotlib.pyplot as plt
+from PyQt5 import QtCore, QtWidgets, QtGui
+from PyQt5.QtCore import Qt
 
-import numpy as np
 
-from PyQt5 import QtCore, QtWidgets, QtGui, sip
-from PyQt5.Qt import Qt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg, NavigationToolbar2QT as Navi
+class LazyModule:
+    """
+    Placeholder of a module, which is imported on first attribute access and then replaces
+    the placeholder in the globals of this file
+
+    numpy and matplotlib are imported in the background after the window is shown (see PreloadJob)
+    or as soon as they are needed.
+    """
+
+    def __init__(self, name, alias):
+        self._name = name
+        self._alias = alias
+
+    def __getattr__(self, attribute):
+        module = importlib.import_module(self._name)
+        globals()[self._alias] = module
+        return getattr(module, attribute)
 
-from pathlib import Path
+
+mpl = LazyModule("matplotlib", "mpl")
+plt = LazyModule("matplotlib.pyplot", "plt")
+np = LazyModule("numpy", "np")
+
+# end of the imports at startup (see --profile-startup)
+IMPORTED = time.perf_counter()
 
 
 __version__ = "0.0.1"
 __author__ = "Nicolas Imstepf"
 
 
+# memory budget of the cache for parsed data files (see DataCache)
+CACHE_BUDGET_MB = 512
+
+# default location and size limit of the binary cache of parsed data files (see DiskCache)
+DISK_CACHE_FOLDER = Path.home() / ".cache" / "plotting-gui"
+DISK_CACHE_LIMIT_MB = 4096
+
+# Colorset according to Bang Wong nature methods | VOL.8 NO.6 | JUNE 2011 | 441
+COLORS = {0: (0, 114 / 255, 178 / 255), 1: (0, 158 / 255, 115 / 255), 2: (213 / 255, 94 / 255, 0),
+          3: (86 / 255, 180 / 255, 233 / 255), 4: (230 / 255, 159 / 255, 0 / 255),
+          5: (204 / 255, 121 / 255, 167 / 255)}
+COLORS.update({i: "black" for i in range(6, 100)})  # unrealistic, but if more than 10 plots are needed
+
+# changes within this time are merged into one update (see UpdateScheduler)
+UPDATE_DELAY_MS = 20
+
+# live tail mode: minimal time between two refreshes of the plot and polling interval (see LiveTail)
+TAIL_INTERVAL_MS = 250
+TAIL_POLL_MS = 1000
+
+# item data role of folder items in the Raw Data tree, which have not created their file items yet
+UNPOPULATED_ROLE = Qt.UserRole + 1
+# item data role of folder items in the Raw Data tree: index of the folder in the FilenameIndex
+FOLDER_ROLE = Qt.UserRole + 2
+# item data role of file items in the Raw Data tree: id of the file in the FilenameIndex
+FILEID_ROLE = Qt.UserRole + 3
+# item data role of file items in the Raw Data tree and Selected files: mtime of the shown sparkline
+SPARKLINE_ROLE = Qt.UserRole + 4
+
+# curves with more points are drawn as min/max envelope of the visible range (see LODPyramid)
+LOD_MIN_POINTS = 20000
+
+# columns of the subplots: index of the x column and of the plotted y columns (see pickColumns)
+DEFAULT_COLUMNS = (0, (1,))
+
+# files of at least STREAM_MIN_MB are read in blocks of STREAM_CHUNK_MB (see StreamReader), the
+# plot shows their overview (min/max envelope, points per block) at most every STREAM_PARTIAL_S
+STREAM_MIN_MB = 64
+STREAM_CHUNK_MB = 8
+STREAM_OVERVIEW_POINTS = 2000
+STREAM_PARTIAL_S = 0.5
+
+# subplots with at least this many curves are drawn as one LineCollection (View > Collection rendering)
+COLLECTION_MIN_CURVES = 20
+
+# figure export (see ExportJob): default resolution, curves with more points (after decimation)
+# are rasterized in vector formats
+EXPORT_DPI = 300
+EXPORT_RASTERIZE_POINTS = 20000
+
+# header metadata of data files (see ColumnIndex)
+COLUMN_INDEX_FILE = DISK_CACHE_FOLDER / "columns" / "index.json"
+
+# metadata of the .csv files of scanned root folders, one SQLite database per folder (see FolderIndex)
+FOLDER_INDEX_FOLDER = DISK_CACHE_FOLDER / "folders"
+# columns of the Raw Data tree from the FolderIndex: header -> column of the database
+TREE_COLUMNS = OrderedDict([("Rows", "rows"), ("x min", "xmin"), ("x max", "xmax"), ("y min", "ymin"),
+                            ("y max", "ymax")])
+
+# sparkline previews of the files in the tree (see sparkline): bins, bytes read per bin of large files,
+# size of the icons (pixels), disk cache and delay after scrolling until the previews of the visible items are made
+SPARKLINE_POINTS = 48
+SPARKLINE_BLOCK_BYTES = 4096
+SPARKLINE_SIZE = (48, 16)
+SPARKLINE_CACHE_FILE = DISK_CACHE_FOLDER / "sparklines" / "sparklines.sqlite"
+SPARKLINE_DELAY_MS = 100
+
+# profiles of Debug>Profile next update (see profileUpdate)
+PROFILE_FOLDER = DISK_CACHE_FOLDER / "profiles"
+
+# session file of myRestart (see saveSession)
+RESTART_SESSION = DISK_CACHE_FOLDER / "restart-session.npz"
+
+# modules imported in the background after the window is shown (see PreloadJob)
+PRELOAD_MODULES = ("numpy", "matplotlib", "matplotlib.pyplot", "matplotlib.figure",
+                   "matplotlib.backends.backend_qt5agg")
+
+# Qt canvas classes (see qtCanvas)
+QT_CANVAS_CLASSES = {}
+
+# resolved rcParams of the themes (see themeStyle)
+THEME_STYLES = {}
+
+# rcParams that MatplotlibCanvas.restyle applies to the existing figure or that are only read when
+# drawing / creating artists; switching to a theme that changes other rcParams rebuilds the subplots
+RESTYLE_KEYS = ("figure.facecolor", "figure.edgecolor", "figure.titlesize", "figure.titleweight",
+                "figure.labelsize", "figure.labelweight", "figure.subplot.", "figure.dpi", "figure.figsize",
+                "axes.facecolor", "axes.edgecolor", "axes.linewidth", "axes.grid", "axes.axisbelow",
+                "axes.prop_cycle", "axes.xmargin", "axes.ymargin", "axes.autolimit_mode", "axes.title",
+                "axes.label", "grid.", "xtick.", "ytick.", "text.color", "text.hinting", "font.", "lines.",
+                "legend.", "savefig.", "boxplot.", "image.", "patch.", "hatch.", "errorbar.", "mathtext.",
+                "path.", "agg.", "axes3d.", "animation.", "keymap.", "date.")
+
+
 class ApplicationWindow(QtWidgets.QMainWindow):
     """
     Class to create the main window
@@ -39,8 +171,9 @@ class ApplicationWindow(QtWidgets.QMainWindow):
 
     """
 
-    def __init__(self):
+    def __init__(self, profilestartup=False):
         super().__init__()
+        self.profilestartup = profilestartup
 
         # Debug Mode
         #   change function of Open Button
@@ -61,6 +194,20 @@ class ApplicationWindow(QtWidgets.QMainWindow):
         self.generalLayout.setColumnStretch(0, 4)
         self.generalLayout.setColumnStretch(1, 1)
 
+        # persistent settings (disk cache, data store)
+        self.settings = QtCore.QSettings("plotting-gui", "plotting-gui")
+        self.diskcache = DiskCache(self.settings.value("diskcache/folder", str(DISK_CACHE_FOLDER)),
+                                   int(self.settings.value("diskcache/limit", DISK_CACHE_LIMIT_MB)) * 2**20)
+        self.diskcache.enabled = self.settings.value("diskcache/enabled", True, type=bool)
+        threading.Thread(target=self.diskcache.prune, daemon=True).start()
+
+        # plotted data (see dataLoaded)
+        self.store = DataStore(self.settings.value("store/float32", False, type=bool),
+                               self.settings.value("store/uniform", True, type=bool))
+
+        # collects changes of subplot lists, labels and theme -> runUpdate
+        self.scheduler = UpdateScheduler(self.runUpdate, delay=UPDATE_DELAY_MS, parent=self)
+
         # Menubar
         self._createMenu()
 
@@ -73,26 +220,72 @@ class ApplicationWindow(QtWidgets.QMainWindow):
         self.xlabel = "x-axis label"
         self.ylabel = "y-axis label"
         self.filelistoflist = []
+        self.theme = None
+        self.dirty = set()
 
         self._createPlot()
 
         # File Explorer
         #   initialize values
-        self.filelst = []
+        self.filelst = {}  # selected files (path -> item of ddlst), in order of selection
+        self.selectionchanges = {}  # path -> checked, applied to ddlst by applySelection
+        self.treeitems = {}  # path -> file item of the tree (created on expand)
+        self.fileindex = FilenameIndex()
         self.filelistoflist = []
         self.filedict = {}
-        self.delimiter = ","
+        self.delimiter = None
         self.folderpath = None
         self.Nsubplots = None
-        self.datalst = []
-        self.Xlist = []
-        self.Ylist = []
-        self.LEGENDS = []
+        self.columns = [DEFAULT_COLUMNS]  # (x column, y columns) of every subplot
+        self.cache = DataCache(maxbytes=CACHE_BUDGET_MB * 2**20)
+        self.loader = CSVLoader()
+        self.columnindex = ColumnIndex(COLUMN_INDEX_FILE)
+
+        # background loading (see readData)
+        self.pool = QtCore.QThreadPool(self)
+        self.loadjob = None
+        self.exportjob = None
+        self.generation = 0
+        self.scanjob = None
+        self.scangeneration = 0
+        self.folderindex = None  # FolderIndex of folderpath
+        self.indexjob = None
+        self.folderitems = {}  # folder -> item of the tree
+        self.scannedfolders = OrderedDict()  # folder -> file names found by the running / last scan
+
+        # sparkline previews of the visible files (see updateSparklines)
+        self.sparklinecache = SparklineCache()
+        self.sparklines = {}  # path -> (mtime, QIcon)
+        self.sparklinejob = None
+        self.sparklinegeneration = 0
+        self.sparklineTimer = QtCore.QTimer(self)
+        self.sparklineTimer.setSingleShot(True)
+        self.sparklineTimer.setInterval(SPARKLINE_DELAY_MS)
+        self.sparklineTimer.timeout.connect(self.updateSparklines)
+
+        # live tail mode (see toggleLiveTail)
+        self.livetail = LiveTail(self.pool, parent=self)
+        self.livetail.updated.connect(self.tailUpdated)
 
         self._createExplorer()
 
+        # Statusbar
+        self.updateStatus()
+        self.timingLabel = QtWidgets.QLabel()
+        self.statusBar().addPermanentWidget(self.timingLabel)
+        self.timingTimer = QtCore.QTimer(self)
+        self.timingTimer.timeout.connect(lambda: self.timingLabel.setText(TRACER.summary()))
+        self.timingTimer.start(250)
+
         # show window
         self.show()
+        TRACER.record("window shown", STARTUP, time.perf_counter())
+
+        # matplotlib is imported in the background, the canvas is created afterwards (see createCanvas)
+        # global thread pool, so scanning and loading do not wait for the imports
+        self.preloadjob = PreloadJob(PRELOAD_MODULES)
+        self.preloadjob.signals.finished.connect(self.createCanvas)
+        QtCore.QThreadPool.globalInstance().start(self.preloadjob)
 
     def _createMenu(self):
         """
@@ -100,11 +293,33 @@ class ApplicationWindow(QtWidgets.QMainWindow):
 
         Menu
             - open folder function
+            - open / save session
             - restart function
             - exit function
 
         Delimiter
+            - detect delimiter of each file automatically
             - select delimiter directly
+
+        Cache
+            - set memory budget
+            - clear cache
+            - enable disk cache
+            - set disk cache folder and size limit
+            - clear disk cache
+
+        View
+            - level of detail
+            - live tail mode
+            - cursor readout
+
+        Export
+            - export figure in the background
+            - resolution, decimation and rasterization of the export
+
+        Debug
+            - record timings to trace file
+            - profile next update
         """
 
         # open folder function
@@ -112,6 +327,15 @@ class ApplicationWindow(QtWidgets.QMainWindow):
         self.openAct.setShortcut("Ctrl+O")
         self.openAct.triggered.connect(self.openfolder)
 
+        # session functions
+        self.openSessionAct = QtWidgets.QAction("Open &session...", self)
+        self.openSessionAct.setShortcut("Ctrl+Shift+O")
+        self.openSessionAct.triggered.connect(lambda: self.openSession())
+
+        self.saveSessionAct = QtWidgets.QAction("&Save session...", self)
+        self.saveSessionAct.setShortcut("Ctrl+Shift+S")
+        self.saveSessionAct.triggered.connect(lambda: self.saveSession())
+
         # restart function
         self.restartAct = QtWidgets.QAction("&Restart", self)
         self.restartAct.setShortcut("Ctrl+R")
@@ -127,10 +351,13 @@ class ApplicationWindow(QtWidgets.QMainWindow):
         self.exitAct.triggered.connect(self.close)
 
         # select Delimiter menu
+        self.autoAct = QtWidgets.QAction("Auto-detect")
+        self.autoAct.setCheckable(True)
+        self.autoAct.setChecked(True)
+
         self.commaAct = QtWidgets.QAction('Comma ","')
         self.commaAct.setShortcut("Ctrl+,")
         self.commaAct.setCheckable(True)
-        self.commaAct.setChecked(True)
 
         self.semicolonAct = QtWidgets.QAction('Semicolon ";"')
         self.semicolonAct.setShortcut("Ctrl+;")
@@ -138,27 +365,515 @@ class ApplicationWindow(QtWidgets.QMainWindow):
 
         # group actions of Delimiter-Menu (only one selected delimiter @ time possible)
         ag = QtWidgets.QActionGroup(self)
+        ag.addAction(self.autoAct)
         ag.addAction(self.commaAct)
         ag.addAction(self.semicolonAct)
 
         # add functions to menubar
         self.menu = self.menuBar().addMenu("&Menu")
         self.menu.addAction(self.openAct)
+        self.menu.addAction(self.openSessionAct)
+        self.menu.addAction(self.saveSessionAct)
         self.menu.addAction(self.updateAct)
         self.menu.addAction(self.restartAct)
         self.menu.addAction(self.exitAct)
 
         self.delimitermenu = self.menuBar().addMenu("&Delimiter")
+        self.delimitermenu.addAction(self.autoAct)
         self.delimitermenu.addAction(self.commaAct)
         self.delimitermenu.addAction(self.semicolonAct)
 
+        # cache menu
+        self.cacheBudgetAct = QtWidgets.QAction("Set memory &budget...", self)
+        self.cacheBudgetAct.triggered.connect(self.setCacheBudget)
+
+        self.cacheClearAct = QtWidgets.QAction("&Clear cache", self)
+        self.cacheClearAct.triggered.connect(self.clearCache)
+
+        self.diskcacheAct = QtWidgets.QAction("&Disk cache", self)
+        self.diskcacheAct.setCheckable(True)
+        self.diskcacheAct.setChecked(self.diskcache.enabled)
+        self.diskcacheAct.toggled.connect(self.enableDiskCache)
+
+        self.diskcacheFolderAct = QtWidgets.QAction("Set disk cache &folder...", self)
+        self.diskcacheFolderAct.triggered.connect(self.setDiskCacheFolder)
+
+        self.diskcacheLimitAct = QtWidgets.QAction("Set disk cache &limit...", self)
+        self.diskcacheLimitAct.triggered.connect(self.setDiskCacheLimit)
+
+        self.float32Act = QtWidgets.QAction("Store data as float&32", self)
+        self.float32Act.setCheckable(True)
+        self.float32Act.setChecked(self.store.float32)
+        self.float32Act.setToolTip("Halves the memory of the data (about 7 significant digits)")
+        self.float32Act.toggled.connect(lambda enabled: self.setStoreOption("float32", enabled))
+
+        self.uniformAct = QtWidgets.QAction("Compress &uniform x axes", self)
+        self.uniformAct.setCheckable(True)
+        self.uniformAct.setChecked(self.store.uniform)
+        self.uniformAct.setToolTip("Stores uniformly spaced x values as start, step and number of points")
+        self.uniformAct.toggled.connect(lambda enabled: self.setStoreOption("uniform", enabled))
+
+        self.diskcacheClearAct = QtWidgets.QAction("Clear disk cache", self)
+        self.diskcacheClearAct.triggered.connect(self.clearDiskCache)
+
+        self.cachemenu = self.menuBar().addMenu("&Cache")
+        self.cachemenu.addAction(self.cacheBudgetAct)
+        self.cachemenu.addAction(self.cacheClearAct)
+        self.cachemenu.addAction(self.float32Act)
+        self.cachemenu.addAction(self.uniformAct)
+        self.cachemenu.addSeparator()
+        self.cachemenu.addAction(self.diskcacheAct)
+        self.cachemenu.addAction(self.diskcacheFolderAct)
+        self.cachemenu.addAction(self.diskcacheLimitAct)
+        self.cachemenu.addAction(self.diskcacheClearAct)
+
+        # view menu
+        self.lodAct = QtWidgets.QAction("&Level of detail", self)
+        self.lodAct.setCheckable(True)
+        self.lodAct.setChecked(True)
+        self.lodAct.setToolTip(f"Draw curves with more than {LOD_MIN_POINTS} points as min/max envelope "
+                               "of the visible range")
+        self.lodAct.toggled.connect(lambda: self.invalidate("data"))
+
+        self.collectionAct = QtWidgets.QAction("C&ollection rendering", self)
+        self.collectionAct.setCheckable(True)
+        self.collectionAct.setChecked(True)
+        self.collectionAct.setToolTip(f"Draw subplots with {COLLECTION_MIN_CURVES} or more curves as one "
+                                      "line collection instead of one line per curve")
+        self.collectionAct.toggled.connect(lambda: self.invalidate("data"))
+
+        self.tailAct = QtWidgets.QAction("Live &tail", self)
+        self.tailAct.setShortcut("Ctrl+T")
+        self.tailAct.setCheckable(True)
+        self.tailAct.setToolTip("Watch the plotted files and add appended rows to the plot")
+        self.tailAct.toggled.connect(self.toggleLiveTail)
+
+        self.readoutAct = QtWidgets.QAction("&Cursor readout", self)
+        self.readoutAct.setShortcut("Ctrl+K")
+        self.readoutAct.setCheckable(True)
+        self.readoutAct.setToolTip("Show crosshair and values of the nearest point while hovering the plot")
+        self.readoutAct.toggled.connect(lambda enabled: self.createCanvas().enableCursorReadout(enabled))
+
+        self.asyncAct = QtWidgets.QAction("Render in &background", self)
+        self.asyncAct.setCheckable(True)
+        self.asyncAct.setChecked(self.settings.value("view/asyncrender", True, type=bool))
+        self.asyncAct.setToolTip("Render the figure in a worker thread, the last frame stays on screen meanwhile")
+        self.asyncAct.toggled.connect(self.enableAsyncRender)
+
+        self.sparklineAct = QtWidgets.QAction("&Sparkline previews", self)
+        self.sparklineAct.setCheckable(True)
+        self.sparklineAct.setChecked(self.settings.value("view/sparklines", True, type=bool))
+        self.sparklineAct.setToolTip("Show a small preview of the second column next to the files in the "
+                                     "Raw Data tree and Selected files")
+        self.sparklineAct.toggled.connect(self.enableSparklines)
+
+        self.viewmenu = self.menuBar().addMenu("&View")
+        self.viewmenu.addAction(self.lodAct)
+        self.viewmenu.addAction(self.collectionAct)
+        self.viewmenu.addAction(self.tailAct)
+        self.viewmenu.addAction(self.readoutAct)
+        self.viewmenu.addAction(self.asyncAct)
+        self.viewmenu.addAction(self.sparklineAct)
+
+        # export menu
+        self.exportAct = QtWidgets.QAction("&Export figure...", self)
+        self.exportAct.setShortcut("Ctrl+E")
+        self.exportAct.triggered.connect(self.exportFigure)
+
+        self.exportDpiAct = QtWidgets.QAction("Set &resolution...", self)
+        self.exportDpiAct.triggered.connect(self.setExportDpi)
+
+        self.exportDecimateAct = QtWidgets.QAction("&Decimate to resolution", self)
+        self.exportDecimateAct.setCheckable(True)
+        self.exportDecimateAct.setChecked(self.settings.value("export/decimate", True, type=bool))
+        self.exportDecimateAct.setToolTip("Export the visible range of every curve as min/max envelope with "
+                                          "2 points per pixel of the output resolution")
+        self.exportDecimateAct.toggled.connect(lambda enabled: self.settings.setValue("export/decimate", enabled))
+
+        self.exportRasterizeAct = QtWidgets.QAction("Rasterize &dense curves", self)
+        self.exportRasterizeAct.setCheckable(True)
+        self.exportRasterizeAct.setChecked(self.settings.value("export/rasterize", True, type=bool))
+        self.exportRasterizeAct.setToolTip(f"Curves with more than {EXPORT_RASTERIZE_POINTS} points are embedded as "
+                                           "image in vector formats (text and axes stay vector)")
+        self.exportRasterizeAct.toggled.connect(lambda enabled: self.settings.setValue("export/rasterize", enabled))
+
+        self.exportmenu = self.menuBar().addMenu("E&xport")
+        self.exportmenu.addAction(self.exportAct)
+        self.exportmenu.addSeparator()
+        self.exportmenu.addAction(self.exportDpiAct)
+        self.exportmenu.addAction(self.exportDecimateAct)
+        self.exportmenu.addAction(self.exportRasterizeAct)
+
+        # debug menu
+        self.traceAct = QtWidgets.QAction("&Record trace...", self)
+        self.traceAct.setCheckable(True)
+        self.traceAct.setToolTip("Record timings of scanning, parsing, building and drawing to a "
+                                 "Chrome trace file (chrome://tracing, ui.perfetto.dev)")
+        self.traceAct.toggled.connect(self.recordTrace)
+
+        self.profileAct = QtWidgets.QAction("&Profile next update", self)
+        self.profileAct.setCheckable(True)
+        self.profileAct.setToolTip("Capture the next update with cProfile")
+
+        self.debugmenu = self.menuBar().addMenu("De&bug")
+        self.debugmenu.addAction(self.traceAct)
+        self.debugmenu.addAction(self.profileAct)
+
+    def enableAsyncRender(self, enabled):
+        """
+        switches between rendering the figure in a worker thread and in the GUI thread
+
+        connected with asyncAct
+        """
+        self.settings.setValue("view/asyncrender", enabled)
+        canvas = self.createCanvas()
+        canvas.asyncrender = enabled
+        canvas.draw_idle()
+
+    def setExportDpi(self):
+        """
+        asks for the resolution of exported figures (dpi), used for raster formats, rasterized
+        curves and the decimation
+
+        called from Export menu
+        """
+        dpi, ok = QtWidgets.QInputDialog.getInt(self, "Export", "Resolution (dpi)",
+                                                self.settings.value("export/dpi", EXPORT_DPI, type=int), 10, 2400)
+        if ok:
+            self.settings.setValue("export/dpi", dpi)
+
+    def exportFigure(self):
+        """
+        exports the figure (pdf, svg, eps, png) in the background (ExportJob)
+        the figure is taken as snapshot, so the plot can be changed meanwhile
+
+        called from Export menu
+        """
+        if self.canv is None or not self.canv.curves:
+            self.statusBar().showMessage("Nothing to export")
+            return None
+        if self.exportjob is not None:
+            self.statusBar().showMessage("Export is still running")
+            return None
+
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Export Figure", "figure.pdf", "PDF (*.pdf);;SVG (*.svg);;EPS (*.eps);;PNG (*.png)")
+        if not path:
+            return None
+
+        dpi = self.settings.value("export/dpi", EXPORT_DPI, type=int)
+        try:
+            figure, curves = self.canv.snapshot()
+        except Exception as e:
+            # the figure cannot be copied for the background: the shown figure is exported in the GUI thread
+            try:
+                self.canv.fig.savefig(path, dpi=dpi)
+            except Exception as error:
+                self.statusBar().showMessage(f"Export failed: {error}")
+            else:
+                self.statusBar().showMessage(f"Exported {path} without background export ({e})")
+            return None
+        self.exportjob = ExportJob(figure, curves, path, dpi,
+                                   self.exportDecimateAct.isChecked(), self.exportRasterizeAct.isChecked())
+        self.exportjob.signals.progress.connect(
+            lambda done, total: self.statusBar().showMessage(f"Exporting {Path(path).name}: {done} / {total} curves"))
+        self.exportjob.signals.finished.connect(self.exportFinished)
+        self.exportjob.signals.failed.connect(self.exportFinished)
+        self.pool.start(self.exportjob)
+
+    def exportFinished(self, message):
+        """
+        shows result of the ExportJob
+
+        connected with ExportJob.signals.finished, failed
+        """
+        self.exportjob = None
+        self.statusBar().showMessage(message)
+
+    def setCacheBudget(self):
+        """
+        asks for the memory budget of the data cache (in MB)
+
+        called from Cache menu
+        """
+        budget, ok = QtWidgets.QInputDialog.getInt(self, "Cache", "Memory budget (MB)",
+                                                   self.cache.maxbytes // 2**20, 0, 1024**2)
+        if ok:
+            self.cache.resize(budget * 2**20)
+            self.updateStatus()
+
+    def clearCache(self):
+        """
+        removes all parsed files from the data cache
+
+        called from Cache menu
+        """
+        self.cache.clear()
+        self.updateStatus()
+
+    def setStoreOption(self, name, enabled):
+        """
+        sets an option of the DataStore (float32, uniform) and loads the data again in the new format
+
+        connected with float32Act, uniformAct
+        """
+        setattr(self.store, name, enabled)
+        self.settings.setValue(f"store/{name}", enabled)
+        # cached entries have the old format
+        self.cache.clear()
+        if self.filelistoflist:
+            self.readData()
+        self.updateStatus()
+
+    def enableDiskCache(self, enabled):
+        """
+        enables / disables the binary disk cache
+
+        connected with diskcacheAct
+        """
+        self.diskcache.enabled = enabled
+        self.settings.setValue("diskcache/enabled", enabled)
+
+    def setDiskCacheFolder(self):
+        """
+        asks for the folder of the disk cache
+
+        called from Cache menu
+        """
+        folder = QtWidgets.QFileDialog.getExistingDirectory(self, "Select Disk Cache Folder", str(self.diskcache.folder))
+        if folder:
+            self.diskcache.folder = Path(folder)
+            self.settings.setValue("diskcache/folder", folder)
+            threading.Thread(target=self.diskcache.prune, daemon=True).start()
+
+    def setDiskCacheLimit(self):
+        """
+        asks for the size limit of the disk cache (in MB)
+
+        called from Cache menu
+        """
+        limit, ok = QtWidgets.QInputDialog.getInt(self, "Disk cache", "Size limit (MB)",
+                                                  self.diskcache.maxbytes // 2**20, 0, 1024**3)
+        if ok:
+            self.diskcache.maxbytes = limit * 2**20
+            self.settings.setValue("diskcache/limit", limit)
+            threading.Thread(target=self.diskcache.prune, daemon=True).start()
+
+    def clearDiskCache(self):
+        """
+        removes all files of the disk cache
+
+        called from Cache menu
+        """
+        self.diskcache.clear()
+        self.updateStatus()
+
+    def parseFile(self, path, delimiter, channels, progress=None):
+        """
+        parses the columns of the Channels of a data file with the loader, using the disk cache if enabled
+        returns {channel: DataEntry in the format of the DataStore}
+        progress(reader, columns) is called after every block of large files (see StreamReader)
+
+        called by DataCache (LoadJob worker threads)
+        """
+        stat = os.stat(path)
+        columns = channelColumns(channels)[path]
+
+        def load(path, delimiter):
+            # only the size of stat is parsed, so the data matches its version even if the file grows meanwhile
+            return self.loader.load(path, delimiter, progress and (lambda reader: progress(reader, columns)), columns,
+                                    stat.st_size)
+
+        if not self.diskcache.enabled:
+            arrays = load(path, delimiter)
+        else:
+            arrays = self.diskcache.get(path, delimiter, load, columns)
+        # header metadata for the column picker
+        self.columnindex.get(path, delimiter)
+
+        values = dict(zip(columns, arrays))
+        # end of the parsed lines, live tail continues from there
+        offset = lineEnd(path, stat.st_size)
+        # stats of the first two columns are known if the folder is indexed
+        info = self.folderindex.stats(path, delimiter) if self.folderindex is not None else None
+        entries = {}
+        for channel in channels:
+            stats = info if channel[1:] == (0, 1) else None
+            entries[channel] = entry = self.store.entry(values[channel.x], values[channel.y], stats)
+            # version of the source file (see saveSession)
+            entry.source = [stat.st_size, stat.st_mtime_ns]
+            entry.offset = offset
+        return entries
+
+    def updateStatus(self):
+        """
+        shows memory of the data, cache and update statistics in the statusbar
+
+        called by dataLoaded, runUpdate and Cache menu
+        """
+        self.statusBar().showMessage(f"{self.store.summary()}    |    {self.cache.summary()}    |    "
+                                     f"{self.diskcache.summary()}    |    "
+                                     f"{self.scheduler.summary()}")
+
+    def recordTrace(self, enabled):
+        """
+        starts recording of timings / saves recorded timings as Chrome trace (JSON)
+
+        connected with traceAct
+        """
+        if enabled:
+            TRACER.startRecording()
+            return None
+
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Save Trace", "trace.json", "Trace (*.json)")
+        events = TRACER.stopRecording()
+        if path:
+            with open(path, "w") as f:
+                json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+            self.statusBar().showMessage(f"{len(events)} trace events saved to {path}")
+
+    def profileUpdate(self):
+        """
+        runs Update with cProfile and saves the profile (.prof) in PROFILE_FOLDER
+
+        called by Update if profileAct is checked
+        """
+        self.profileAct.setChecked(False)
+        profiler = cProfile.Profile()
+        profiler.runcall(self._update)
+
+        path = PROFILE_FOLDER / time.strftime("update-%Y%m%d-%H%M%S.prof")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(path)
+        except OSError as e:
+            self.statusBar().showMessage(f"Profile could not be saved: {e}")
+            return None
+        self.statusBar().showMessage(f"Profile saved to {path} (open with snakeviz or python -m pstats)")
+
     def myRestart(self):
         """
         Restart function for the Menubar
+        the current state is saved as session and opened again after the restart (--session)
 
         called from menu & "Ctrl+R" shortcut
         """
-        os.execl(sys.executable, sys.executable, *sys.argv)
+        argv = list(sys.argv)
+        while "--session" in argv:
+            i = argv.index("--session")
+            del argv[i:i + 2]
+
+        RESTART_SESSION.parent.mkdir(parents=True, exist_ok=True)
+        self.saveSession(RESTART_SESSION)
+        os.execl(sys.executable, sys.executable, *argv, "--session", str(RESTART_SESSION))
+
+    def saveSession(self, path=None):
+        """
+        saves folder, selected files, subplots, labels, theme and delimiter together with the
+        loaded data (compressed binary snapshot) as session file (.npz)
+
+        called from menu, myRestart
+        """
+        if path is None:
+            path, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Save Session", "session.npz", "Session (*.npz)")
+            if not path:
+                return None
+        path = Path(path).with_suffix(".npz")
+
+        delimiter = "auto" if self.autoAct.isChecked() else self.delimiter
+        meta = {"version": __version__, "folder": self.folderpath, "selected": [str(i) for i in self.filelst],
+                "subplots": [[str(i) for i in filelist] for filelist in self.filelistoflist],
+                "columns": [[x, list(ycolumns)] for x, ycolumns in self.columns],
+                "title": self.title, "xlabel": self.xlabel, "ylabel": self.ylabel,
+                "theme": self.ThemeBox.currentText(), "delimiter": delimiter}
+        writeSession(path, meta, self.store.channels, self.store.entries)
+        self.statusBar().showMessage(f"Session saved to {path}")
+
+    def openSession(self, path=None):
+        """
+        restores a session file (see saveSession), the plot is created from the snapshot
+        without parsing any file; if source files changed since the snapshot, they can be
+        loaded again from disk
+
+        called from menu, __main__ (--session)
+        """
+        if path is None:
+            path, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Open Session", "", "Session (*.npz)")
+            if not path:
+                return None
+
+        try:
+            meta, snapshot = readSession(path)
+        except (OSError, ValueError, KeyError) as e:
+            self.statusBar().showMessage(f"Opening session failed: {e}")
+            return None
+
+        if self.loadjob is not None:
+            self.loadjob.cancel()
+            self.loadjob = None
+
+        # delimiter, labels & theme
+        delimiterActs = {"auto": self.autoAct, ",": self.commaAct, ";": self.semicolonAct}
+        delimiterActs.get(meta["delimiter"], self.autoAct).setChecked(True)
+        self.delimiter = None if meta["delimiter"] == "auto" else meta["delimiter"]
+        self.title, self.xlabel, self.ylabel = meta["title"], meta["xlabel"], meta["ylabel"]
+        self.titleEdit.setText(self.title)
+        self.xlabelEdit.setText(self.xlabel)
+        self.ylabelEdit.setText(self.ylabel)
+        self.ThemeBox.setCurrentText(meta["theme"])
+
+        # folder (scanned in the background), selected files & subplots
+        self.folderpath = meta["folder"]
+        if self.folderpath and os.path.isdir(self.folderpath):
+            self.UpdateTree()
+        self.filelst = dict.fromkeys(Path(i) for i in meta["selected"])
+        self.DragDropList()
+        filelistoflist = [[Path(i) for i in filelist] for filelist in meta["subplots"]]
+        self.filedict.update({file.stem: file for filelist in filelistoflist for file in filelist})
+
+        self.spinBox.setValue(max(len(filelistoflist), 1))
+        for subplotList, filelist in zip(self.subplotList, filelistoflist):
+            subplotList.clear()
+            subplotList.addItems([i.stem for i in filelist])
+        # the data is taken from the snapshot instead of loading the subplots again
+        self.scheduler.discard("order")
+        self.filelistoflist = filelistoflist
+        columns = meta.get("columns", [DEFAULT_COLUMNS] * len(filelistoflist))
+        self.columns = [(x, tuple(ycolumns)) for x, ycolumns in columns]
+
+        # data: unchanged files are added to the cache, so they are not parsed when the subplots change
+        data = {}
+        changed = []
+        missing = []
+        for (file, source, *columns), (x, y) in zip(meta["files"], snapshot):
+            channel = Channel(Path(file), *(columns or (0, 1)))
+            data[channel] = entry = self.store.entry(x, y)
+            try:
+                stat = os.stat(channel.path)
+            except OSError:
+                missing.append(channel.path)
+                continue
+            if [stat.st_size, stat.st_mtime_ns] != source:
+                changed.append(channel.path)
+                continue
+            entry.source = source
+            self.cache.put(DataCache.key(channel.path, self.delimiter, channel[1:]), entry)
+        changed = list(OrderedDict.fromkeys(changed))
+        missing = list(OrderedDict.fromkeys(missing))
+
+        self.generation += 1
+        channellists = [[i for i in channellist if i in data] for channellist in self.channelLists()]
+        self.dataLoaded(self.generation, channellists, data)
+        self.statusBar().showMessage(f"Session {path} opened ({len(data)} curves from snapshot"
+                                     + (f", {len(missing)} source files missing)" if missing else ")"))
+
+        if changed and not missing:
+            answer = QtWidgets.QMessageBox.question(
+                self, "Session", f"{len(changed)} source files changed since the session was saved:\n"
+                + "\n".join(i.name for i in changed[:10]) + ("\n..." if len(changed) > 10 else "")
+                + "\n\nLoad the changed files from disk?")
+            if answer == QtWidgets.QMessageBox.Yes:
+                self.readData()
 
     def _createToolbar(self):
         """
@@ -196,10 +911,55 @@ class ApplicationWindow(QtWidgets.QMainWindow):
         """
         Matplotlib navigation functions
         sublayout of toolbar
+
+        The plot canvas and its navigation toolbar are created by createCanvas, after matplotlib
+        was imported in the background or as soon as they are needed.
+        """
+        self.plotcanv = None
+        self.plottoolbar = None
+
+        # currently shown canvas & toolbar (plot canvas or special plotting style)
+        self.canv = None
+        self.toolbar = None
+
+    def createCanvas(self):
+        """
+        creates the persistent plot canvas and its navigation toolbar (only once)
+        returns the plot canvas
+
+        connected with PreloadJob.signals.finished, called by Update, readoutAct and asyncAct
         """
-        self.canv = MatplotlibCanvas(self)
-        self.toolbar = Navi(self.canv, self._centralWidget)
+        if self.plotcanv is not None:
+            return self.plotcanv
+
+        from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as Navi
+
+        with TRACER.span("canvas"):
+            self.plotcanv = qtCanvas(MatplotlibCanvas)(self)
+            self.plottoolbar = Navi(self.plotcanv, self._centralWidget)
+            self.plotcanv.enableCursorReadout(self.readoutAct.isChecked())
+            self.plotcanv.asyncrender = self.asyncAct.isChecked()
+
+        self.canv = self.plotcanv
+        self.toolbar = self.plottoolbar
         self.ToolbarLayout.addWidget(self.toolbar)
+        self.plotcanv.hide()
+
+        if self.profilestartup:
+            QtCore.QTimer.singleShot(0, self.printStartupProfile)
+        return self.plotcanv
+
+    def printStartupProfile(self):
+        """
+        prints the import and init times recorded since startup (--profile-startup)
+
+        called by createCanvas
+        """
+        events = TRACER.stopRecording()
+        print(f"{'startup':<45} {'start (ms)':>10} {'duration (ms)':>14}")
+        for event in sorted(events, key=lambda i: i["ts"]):
+            print(f"{event['name']:<45} {event['ts'] / 1000 - STARTUP * 1000:10.1f} {event['dur'] / 1000:14.1f}")
+        print(f"{'ready':<45} {(time.perf_counter() - STARTUP) * 1000:10.1f}")
 
     def _createOpenFolder(self):
         """
@@ -238,110 +998,237 @@ class ApplicationWindow(QtWidgets.QMainWindow):
         self.spacerItem = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
         self.PlotLayout.addItem(self.spacerItem)
         self.generalLayout.addLayout(self.PlotLayout, 1, 0)
-        self.ThemeBox.currentIndexChanged['QString'].connect(self.Update)
+        self.ThemeBox.currentIndexChanged['QString'].connect(self.changedTheme)
+
+    def invalidate(self, *dirty):
+        """
+        marks parts of the plot as outdated, the update is scheduled (UpdateScheduler)
+
+        dirty: "order" (subplot lists -> readData), "labels" (title & axis labels), "data" (curves),
+               "theme" (rebuild of the whole figure)
+        """
+        self.scheduler.invalidate(*dirty)
+
+    def runUpdate(self, dirty):
+        """
+        runs the merged changes of the UpdateScheduler
+
+        called by UpdateScheduler
+        """
+        self.dirty.update(dirty - {"order"})
+
+        if "order" in dirty:
+            self.updateSubplotOrder()
+        if self.dirty:
+            self.Update()
+
+        self.updateStatus()
 
     def Update(self, value=None):
         """
         creates / updates plot with new data
 
-        called by: changedTitle, changedXlabel, changedYlabel, changedLabels, readData
+        only the outdated parts of the plot (self.dirty) are updated in the existing canvas:
+            - "labels": suptitle, supxlabel, supylabel
+            - "data": curves are added, removed or updated with set_data
+            - "theme" or changed number of subplots: style is applied and subplots are rebuilt
+        an Update without dirty parts rebuilds the whole figure
+
+        called by: invalidate, changedTheme, changedTitle, changedXlabel, changedYlabel, changedLabels, dataLoaded
+        """
+        if self.profileAct.isChecked():
+            self.profileUpdate()
+        else:
+            self._update()
+
+    def _update(self):
+        """
+        see Update
         """
         value = self.ThemeBox.currentText()
+        dirty = self.dirty or {"theme"}
+        self.dirty = set()
 
-        # close and reset plot
-        plt.close()
-        plt.clf()
-        mpl.rcParams.update(mpl.rcParamsDefault)
+        self.createCanvas()
 
         # special plotting style
         if self.Nsubplots == 42:
-            self.ToolbarLayout.removeWidget(self.toolbar)
-            self.PlotLayout.removeWidget(self.canv)
             self.xkcdPlot()
             return None
 
         # special plotting style
         if self.Nsubplots == 0:
-            self.ToolbarLayout.removeWidget(self.toolbar)
-            self.PlotLayout.removeWidget(self.canv)
             self.myPlot()
             return None
 
-        if self.filelistoflist:
+        if self.filelistoflist and self.store.subplots:
+            # show persistent canvas & toolbar (after special plotting styles or first plot)
+            self._showCanvas(self.plotcanv, self.plottoolbar)
 
-            # use style from themebox
-            if value is not None and value != "default":
-                plt.style.use(value)
+            # theme switch: restyle the existing artists if the themes only differ in colors, fonts, ...
+            restyle = (value != self.theme and self.theme is not None
+                       and len(self.store.subplots) == self.canv.nsubplots
+                       and canRestyle(themeStyle(self.theme), themeStyle(value)))
+            rebuild = not restyle and ("theme" in dirty or value != self.theme
+                                       or len(self.store.subplots) != self.canv.nsubplots)
 
-            self.ToolbarLayout.removeWidget(self.toolbar)
-            self.PlotLayout.removeWidget(self.canv)
+            with TRACER.span("build", dirty=sorted(dirty), restyle=restyle):
+                if rebuild or restyle:
+                    # use style from themebox
+                    mpl.rcParams.update(themeStyle(value))
+                    self.theme = value
 
-            # remove toolbar & canvas
-            sip.delete(self.toolbar)
-            sip.delete(self.canv)
+                if rebuild:
+                    self.canv.setupAxes(len(self.store.subplots))
+                elif restyle:
+                    self.canv.restyle()
 
-            self.toolbar = None
-            self.canv = None
-            self.PlotLayout.removeItem(self.spacerItem)
+                if rebuild or "data" in dirty:
+                    self.updateCurves()
+                elif restyle:
+                    self.updateColors()
 
-            # create toolbar & canvas
-            self.canv = MatplotlibCanvas(self, nsubplots=self.Nsubplots)
-            self.toolbar = Navi(self.canv, self._centralWidget)
+                if rebuild or restyle or "labels" in dirty:
+                    setLabels(self.canv.fig, self.title, self.xlabel, self.ylabel)
 
-            self.ToolbarLayout.addWidget(self.toolbar)
-            self.PlotLayout.addWidget(self.canv)
+            self.canv.draw()
 
-            axs = self.canv.axs
+    def updateCurves(self):
+        """
+        updates the curves of all subplots in place
+            - curves of new files are added, curves of removed files are removed
+            - existing curves are updated with set_data (stacking offset, color, label)
+            - subplots with many curves are drawn as one LineCollection (collectionAct)
 
-            # Colorset according to Bang Wong nature methods | VOL.8 NO.6 | JUNE 2011 | 441
-            COLORS = {0: (0, 114 / 255, 178 / 255), 1: (0, 158 / 255, 115 / 255), 2: (213 / 255, 94 / 255, 0),
-                      3: (86 / 255, 180 / 255, 233 / 255), 4: (230 / 255, 159 / 255, 0 / 255),
-                      5: (204 / 255, 121 / 255, 167 / 255)}
-            COLORS.update({i: "black" for i in range(6, 100)})  # unrealistic, but if more than 10 plots are needed
+        called by Update
+        """
+        value = self.ThemeBox.currentText()
 
-            if self.Nsubplots == 1:
-                # create plot
-                if value is None or value == "default":
-                    [axs.plot(self.Xlist[0][i]+i*0.1, self.Ylist[0][i]+i*max(self.Ylist[0][0])/5,
-                              label=self.LEGENDS[0][i], color=COLORS[i]) for i in reversed(range(len(self.Xlist[0])))]
-                else:
-                    [axs.plot(self.Xlist[0][i] + i * 0.1, self.Ylist[0][i] + i * max(self.Ylist[0][0]) / 5,
-                              label=self.LEGENDS[0][i]) for i in reversed(range(len(self.Xlist[0])))]
+        lines = {}
+        for j, axs in enumerate(self.canv.axlist):
+            channels = self.store.channellist(j)
+            entries = self.store.curves(j)
+            labels = [self.channelLabel(i, channels) for i in channels]
+            n = len(entries)
+
+            # key of curve: (subplot, channel, occurrence of channel in subplot)
+            keys = []
+            for channel in channels:
+                keys.append((j, channel, sum(1 for k in keys if k[1] == channel)))
+
+            stats = [i.stats for i in entries]
+            xoffsets, yoffsets = stackOffsets(n, stats[0].ymax if n else 0)
+            colors = curveColors(n, value)
+            curves = [(entries[i].x, entries[i].y, xoffsets[i], yoffsets[i], self.getPyramid(entries[i]))
+                      for i in range(n)]
+
+            if self.collectionAct.isChecked() and n >= COLLECTION_MIN_CURVES:
+                # data limits of all curves in one vectorized pass (relim ignores collections)
+                limits = np.array([[i.xmin, i.xmax, i.ymin, i.ymax] for i in stats]).reshape(-1, 4)
+                limits += np.column_stack((xoffsets, xoffsets, yoffsets, yoffsets))
+                # previous lines of the subplot are removed below
+                handles = self.canv.setCollection(axs, curves, colors, labels, limits)
+                lines.update(zip(keys, handles))
+            else:
+                self.canv.removeCollection(axs)
+                for i in range(n):
+                    line = self.canv.lines.pop(keys[i], None)
+                    if line is None or line.axes is None:
+                        # new curve or legend proxy of a collection
+                        line, = axs.plot([], [])
+                    self.canv.setCurve(line, *curves[i])
+                    line.set_label(labels[i])
+                    line.set_color(colors[i])
+                    # first curve on top
+                    line.set_zorder(2 - 0.5 * i / n)
+                    lines[keys[i]] = line
+
+            with TRACER.span("legend"):
+                addLegend(axs, [lines[keys[i]] for i in range(n)])
+
+        # remove curves of removed files
+        for line in self.canv.lines.values():
+            self.canv.removeCurve(line)
+        self.canv.lines = lines
+
+        for axs in self.canv.axlist:
+            axs.relim()
+            self.canv.updateCollectionLimits(axs)
+            axs.autoscale_view()
+
+    def updateColors(self):
+        """
+        sets the colors of the curves and the legends for the current theme, the data is not touched
 
-                # add legend (reversed order needed)
-                # adapted from unutbu stackoverflow.com/questions/34576059/reverse-the-order-of-a-legend
-                handles, labels = axs.get_legend_handles_labels()
-                axs.legend(handles[::-1], labels[::-1], frameon=False).set_draggable(True)
+        called by Update (theme switch with restyle)
+        """
+        value = self.ThemeBox.currentText()
+        for j, axs in enumerate(self.canv.axlist):
+            # curves in order of the subplot list (see updateCurves)
+            handles = [line for key, line in self.canv.lines.items() if key[0] == j]
+            self.canv.setColors(axs, handles, curveColors(len(handles), value))
+            with TRACER.span("legend"):
+                addLegend(axs, handles)
+
+    def channelLabel(self, channel, channels=()):
+        """
+        legend label of a Channel: file name, with the name of the y column if it is not the
+        second column or other columns of the file are plotted in the same subplot (channels)
 
-            else:
-                # create subplots
-                for j in range(self.Nsubplots):
-                    if value is None or value == "default":
-                        [axs[j].plot(self.Xlist[j][i]+i*0.1, self.Ylist[j][i]+i*max(self.Ylist[j][0])/5,
-                                label=self.LEGENDS[j][i], color=COLORS[i]) for i in reversed(range(len(self.Xlist[j])))]
-                    else:
-                        [axs[j].plot(self.Xlist[j][i] + i * 0.1, self.Ylist[j][i] + i * max(self.Ylist[j][0]) / 5,
-                                label=self.LEGENDS[j][i]) for i in reversed(range(len(self.Xlist[j])))]
-
-                    # add legend
-                    handles, labels = axs[j].get_legend_handles_labels()
-                    axs[j].legend(handles[::-1], labels[::-1], frameon=False).set_draggable(True)
-
-                    # add title (for navibar)
-                    if j == 0:
-                        axs[j].set_title(f"{j+1}    (Top)", visible=False)
-                    elif j == self.Nsubplots-1:
-                        axs[j].set_title(f"{j+1}    (Bottom)", visible=False)
-                    else:
-                        axs[j].set_title(j+1, visible=False)
+        called by updateCurves
+        """
+        if channel[1:] == (0, 1) and all(i.path != channel.path or i[1:] == (0, 1) for i in channels):
+            return channel.path.stem
+        try:
+            names = self.columnindex.get(channel.path, self.delimiter)["names"]
+        except OSError:
+            names = []
+        name = names[channel.y] if channel.y < len(names) else f"column {channel.y + 1}"
+        return f"{channel.path.stem}: {name}"
+
+    def getPyramid(self, entry):
+        """
+        returns LODPyramid of a DataEntry (usually created by LoadJob), None if level of detail
+        is disabled or not needed
+
+        called by updateCurves
+        """
+        if not self.lodAct.isChecked() or entry.n <= LOD_MIN_POINTS:
+            return None
 
+        if entry.pyramid is None:
+            entry.pyramid = LODPyramid.create(entry.x, entry.y)
+        return entry.pyramid
 
-            # set labels and title
-            self.canv.fig.suptitle(self.title, fontsize=16)
-            self.canv.fig.supxlabel(self.xlabel)
-            self.canv.fig.supylabel(self.ylabel)
+    def _showCanvas(self, canvas, toolbar):
+        """
+        shows canvas in PlotLayout and toolbar in ToolbarLayout
+        canvas & toolbar of special plotting styles are deleted when replaced, the plot canvas persists
 
-            self.canv.draw()
+        called by Update, xkcdPlot, myPlot
+        """
+        if canvas is self.canv and self.PlotLayout.indexOf(canvas) != -1:
+            return None
+
+        if self.PlotLayout.indexOf(self.canv) != -1:
+            self.PlotLayout.removeWidget(self.canv)
+        else:
+            self.PlotLayout.removeItem(self.spacerItem)
+        self.ToolbarLayout.removeWidget(self.toolbar)
+
+        if self.canv is self.plotcanv:
+            self.canv.hide()
+            self.toolbar.hide()
+        else:
+            self.canv.deleteLater()
+            self.toolbar.deleteLater()
+
+        self.canv = canvas
+        self.toolbar = toolbar
+        self.PlotLayout.addWidget(self.canv)
+        self.ToolbarLayout.addWidget(self.toolbar)
+        self.canv.show()
+        self.toolbar.show()
 
     def xkcdPlot(self):
         """
@@ -349,11 +1236,10 @@ class ApplicationWindow(QtWidgets.QMainWindow):
 
         called by update
         """
-        self.PlotLayout.removeItem(self.spacerItem)
-        self.canv = xkcdPlot(self)
-        self.PlotLayout.addWidget(self.canv)
-        self.toolbar = Navi(self.canv, self._centralWidget)
-        self.ToolbarLayout.addWidget(self.toolbar)
+        from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as Navi
+
+        canvas = qtCanvas(xkcdPlot)(self)
+        self._showCanvas(canvas, Navi(canvas, self._centralWidget))
         self.canv.draw()
 
     def myPlot(self):
@@ -362,11 +1248,10 @@ class ApplicationWindow(QtWidgets.QMainWindow):
 
         called by update
         """
-        self.PlotLayout.removeItem(self.spacerItem)
-        self.canv = myPlot(self)
-        self.PlotLayout.addWidget(self.canv)
-        self.toolbar = Navi(self.canv, self._centralWidget)
-        self.ToolbarLayout.addWidget(self.toolbar)
+        from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as Navi
+
+        canvas = qtCanvas(myPlot)(self)
+        self._showCanvas(canvas, Navi(canvas, self._centralWidget))
         self.canv.draw()
 
     def _createExplorer(self):
@@ -383,6 +1268,7 @@ class ApplicationWindow(QtWidgets.QMainWindow):
         |               |
         | SubplotList   |
         |               |
+        | ProgressBar   |
         |_______________|
         """
         self.ExplorerLayout = QtWidgets.QVBoxLayout()
@@ -391,6 +1277,7 @@ class ApplicationWindow(QtWidgets.QMainWindow):
         self._createTree()
         self._createDragDropList()
         self._createSubplots()
+        self._createProgressBar()
 
         # Add scroll area to explorer
         scrollwidget = QtWidgets.QWidget()
@@ -402,6 +1289,16 @@ class ApplicationWindow(QtWidgets.QMainWindow):
 
         self.generalLayout.addWidget(scroll, 1, 1)
 
+    def _createProgressBar(self):
+        """
+        Progress of loading data files, only visible while loading
+        sublayout of Explorer
+        """
+        self.progressBar = QtWidgets.QProgressBar()
+        self.progressBar.setFormat("loading files %v / %m")
+        self.progressBar.setVisible(False)
+        self.ExplorerLayout.addWidget(self.progressBar)
+
     def _createSetLabels(self):
         """
         Layout to change Labels
@@ -429,7 +1326,7 @@ class ApplicationWindow(QtWidgets.QMainWindow):
 
         # Update button
         self.updatebtn = QtWidgets.QPushButton("Update")
-        self.updatebtn.clicked.connect(self.Update)
+        self.updatebtn.clicked.connect(self.changedLabels)
         self.LabelsLayout.addWidget(self.updatebtn)
 
         self.LabelGroupBox.setLayout(self.LabelsLayout)
@@ -441,7 +1338,7 @@ class ApplicationWindow(QtWidgets.QMainWindow):
         linked with titleEdit
         """
         self.title = self.titleEdit.text()
-        self.Update()
+        self.invalidate("labels")
 
     def changedXlabel(self):
         """
@@ -449,7 +1346,7 @@ class ApplicationWindow(QtWidgets.QMainWindow):
         linked with xlabelEdit
         """
         self.xlabel = self.xlabelEdit.text()
-        self.Update()
+        self.invalidate("labels")
 
     def changedYlabel(self):
         """
@@ -457,14 +1354,21 @@ class ApplicationWindow(QtWidgets.QMainWindow):
         linked with ylabelEdit
         """
         self.ylabel = self.ylabelEdit.text()
-        self.Update()
+        self.invalidate("labels")
 
     def changedLabels(self):
         """
-        updates plot
+        updates plot (complete rebuild)
         linked with update button
         """
-        self.Update()
+        self.invalidate("theme")
+
+    def changedTheme(self):
+        """
+        applies theme to plot
+        linked with ThemeBox
+        """
+        self.invalidate("theme")
 
     def _createTree(self):
         """
@@ -473,10 +1377,29 @@ class ApplicationWindow(QtWidgets.QMainWindow):
         """
         self.treeGroupBox = QtWidgets.QGroupBox("Raw Data")
 
+        self.treeFilter = QtWidgets.QLineEdit()
+        self.treeFilter.setPlaceholderText("Filter file names")
+        self.treeFilter.setClearButtonEnabled(True)
+        self.treeFilter.textChanged.connect(self.filterTree)
+
         self.tree = QtWidgets.QTreeWidget()
-        self.tree.itemClicked.connect(self.check_status)
-        self.tree.setHeaderLabels([""])
+        self.tree.itemChanged.connect(self.check_status)
+        self.tree.itemExpanded.connect(self.populateFolder)
+        self.tree.setHeaderLabels([""] + list(TREE_COLUMNS))
+        self.tree.header().setSectionsClickable(True)
+        self.tree.header().sectionClicked.connect(self.sortTree)
+
+        self.selectionTimer = QtCore.QTimer(self)
+        self.selectionTimer.setSingleShot(True)
+        self.selectionTimer.timeout.connect(self.applySelection)
+
+        self.tree.setIconSize(QtCore.QSize(*SPARKLINE_SIZE))
+        self.tree.verticalScrollBar().valueChanged.connect(self.requestSparklines)
+        self.tree.model().rowsInserted.connect(self.requestSparklines)
+        self.tree.model().layoutChanged.connect(self.requestSparklines)
+
         self.treeLayout = QtWidgets.QVBoxLayout()
+        self.treeLayout.addWidget(self.treeFilter)
         self.treeLayout.addWidget(self.tree)
         self.treeGroupBox.setLayout(self.treeLayout)
         self.ExplorerLayout.addWidget(self.treeGroupBox)
@@ -484,103 +1407,499 @@ class ApplicationWindow(QtWidgets.QMainWindow):
     def UpdateTree(self):
         """
         Creates tree from selected directory
+        the known files of the directory (FolderIndex) are shown at once, then the directory is scanned
+        in the background (ScanJob), folders with .csv files are added / updated in batches -> addFolders;
+        a running scan of another directory is cancelled
 
         called by openfolder
         """
+        if self.scanjob is not None:
+            self.scanjob.cancel()
+        if self.indexjob is not None:
+            self.indexjob.cancel()
+            self.indexjob = None
+
         self.tree.clear()
-        self.tree.setHeaderLabels([self.folderpath])
+        self.treeitems = {}
+        self.folderitems = {}
+        self.scannedfolders = OrderedDict()
+        self.fileindex = FilenameIndex()
+        self.tree.setHeaderLabels([self.folderpath] + list(TREE_COLUMNS))
+        self.tree.setColumnWidth(0, 400)
+
+        self.scangeneration += 1
+        if self.folderindex is not None:
+            self.folderindex.close()
+        self.folderindex = FolderIndex(self.folderpath)
+        known = self.folderindex.open()
+        if known:
+            self.addFolders(self.scangeneration, [(Path(folder), names) for folder, names in known.items()], False)
+
+        self.scanstart = time.perf_counter()
+        self.scanjob = ScanJob(self.scangeneration, self.folderpath)
+        self.scanjob.signals.batch.connect(self.addFolders)
+        self.scanjob.signals.finished.connect(self.scanFinished)
+        self.pool.start(self.scanjob)
+        self.statusBar().showMessage(f"Scanning {self.folderpath} ..." + (f"    |    {self.folderindex.error}"
+                                                                           if self.folderindex.error else ""))
+
+    def addFolders(self, generation, folders, scanned=True):
+        """
+        adds folders (with their .csv files) to the tree, file items are created on expand
+        folders which are already in the tree (from the FolderIndex) get the scanned file names
+
+        connected with ScanJob.signals.batch, called by UpdateTree (scanned False)
+        """
+        if generation != self.scangeneration:
+            return None
 
-        # iteration over data files
-        for folderName, subfolders, filenames in os.walk(self.folderpath):
-            parent = QtWidgets.QTreeWidgetItem(self.tree)
-            parent.setText(0, Path(folderName).name)
+        items = []
+        for folder, filenames in folders:
+            if scanned:
+                self.scannedfolders[folder] = filenames
+            parent = self.folderitems.get(folder)
+            if parent is not None:
+                self.updateFolder(parent, filenames)
+                continue
+
+            parent = self.folderitems[folder] = QtWidgets.QTreeWidgetItem(self.tree)
+            parent.setText(0, folder.name)
+            parent.setData(0, Qt.UserRole, folder)
             parent.setFlags(parent.flags() | Qt.ItemIsTristate | Qt.ItemIsUserCheckable)
+            parent.setCheckState(0, Qt.Unchecked)
+            parent.setChildIndicatorPolicy(QtWidgets.QTreeWidgetItem.ShowIndicator)
+            # file names of folder until the file items are created
+            parent.setData(0, UNPOPULATED_ROLE, filenames)
+            parent.setData(0, FOLDER_ROLE, self.fileindex.add(folder, filenames))
+            items.append(parent)
+
+        hits = self.filterHits(self.treeFilter.text())
+        if hits is not None:
+            folders = {self.fileindex.folders[i] for i in hits}
+            for parent in items:
+                parent.setHidden(parent.data(0, FOLDER_ROLE) not in folders)
+
+        if scanned:
+            self.statusBar().showMessage(f"Scanning {self.folderpath} ... {len(self.scannedfolders)} folders")
+
+    def updateFolder(self, parent, filenames):
+        """
+        sets the scanned file names of a folder item, the items of files which still exist are kept
 
-            for filename in filenames:
-                if filename[-4:].lower() == ".csv":
-                    child = QtWidgets.QTreeWidgetItem(parent)
-                    child.setText(0, Path(filename).name)
-                    child.setData(0, Qt.UserRole, Path(self.folderpath, folderName, filename))
-                    child.setFlags(child.flags() | Qt.ItemIsUserCheckable)
-                    child.setCheckState(0, Qt.Unchecked)
+        called by addFolders
+        """
+        folder = parent.data(0, Qt.UserRole)
+        if parent.data(0, UNPOPULATED_ROLE) is not None:
+            if sorted(parent.data(0, UNPOPULATED_ROLE)) != sorted(filenames):
+                parent.setData(0, UNPOPULATED_ROLE, filenames)
+                parent.setData(0, FOLDER_ROLE, self.fileindex.add(folder, filenames))
+            return None
 
-            if parent.childCount() == 0:
-                parent.setHidden(True)
+        children = {parent.child(j).text(0): parent.child(j) for j in range(parent.childCount())}
+        if sorted(children) == sorted(filenames):
+            return None
+        parent.setData(0, FOLDER_ROLE, self.fileindex.add(folder, filenames))
+        for fileid, filename in enumerate(filenames, self.fileindex.starts[parent.data(0, FOLDER_ROLE)]):
+            child = children.pop(filename, None)
+            if child is None:
+                self.addFileItem(parent, filename, fileid, Qt.Unchecked)
+            else:
+                child.setData(0, FILEID_ROLE, fileid)
+        for child in children.values():
+            self.removeFileItem(child)
 
-        self.tree.setColumnWidth(0, 800)
+    def addFileItem(self, parent, filename, fileid, state):
+        """
+        creates the item of a file in the folder item parent, with the metadata columns of the FolderIndex
+        """
+        path = Path(parent.data(0, Qt.UserRole), filename)
+        child = QtWidgets.QTreeWidgetItem(parent)
+        child.setText(0, filename)
+        child.setData(0, Qt.UserRole, path)
+        child.setData(0, FILEID_ROLE, fileid)
+        child.setFlags(child.flags() | Qt.ItemIsUserCheckable)
+        child.setCheckState(0, state)
+        self.setFileColumns(child, self.folderindex.files.get(str(path)))
+        self.treeitems[path] = child
+        return child
+
+    def removeFileItem(self, child):
+        """
+        removes the item of a file which is gone (and the file from the selected files)
+        """
+        path = child.data(0, Qt.UserRole)
+        if path in self.filelst:
+            self.unselectFile(path)
+        self.treeitems.pop(path, None)
+        child.parent().removeChild(child)
 
-    def check_status(self):
+    def setFileColumns(self, child, info):
+        """
+        shows rows and data range of a file (FileInfo or None) in the columns of the tree (TREE_COLUMNS)
+        numbers are set as data, so the columns are sorted numerically
         """
-        starts when item of tree is clicked
-        call/create DragDropList
-        creates Plot if > 1 item is selected -> readData()
+        values = info[3:] if info is not None else [None] * len(TREE_COLUMNS)
+        for column, value in enumerate(values, 1):
+            if isinstance(value, float):
+                value = float(f"{value:.6g}")
+            child.setData(column, Qt.DisplayRole, value)
 
-        connected with tree.itemClicked
+    def sortTree(self, column):
         """
-        self.filelst = []
-        root = self.tree.invisibleRootItem()
-        for i in range(root.childCount()):
-            subroot = root.child(i)
-            for j in range(subroot.childCount()):
-                item = subroot.child(j)
-                if item.checkState(0) == QtCore.Qt.Checked:
-                    self.filelst.append(item.data(0, Qt.UserRole))
+        switches on sorting by the clicked column of the tree (until then, the folders are in the order of scanning)
 
-        self.DragDropList()
+        connected with the header of tree
+        """
+        if not self.tree.isSortingEnabled():
+            self.tree.setSortingEnabled(True)
+            self.tree.sortByColumn(column, Qt.AscendingOrder)
 
-    def _createDragDropList(self):
+    def scanFinished(self, generation):
         """
-        Layout to show selected files
-            functions
-                - change order (drag & drop)
-                - remove items with doubleclick
-        sublayout of Explorer
+        removes the folders of the FolderIndex which are gone, stores the scanned files in the index
+        and starts indexing the new and changed files (IndexJob) -> indexUpdated
+
+        connected with ScanJob.signals.finished
         """
-        self.ddlstGroupBox = QtWidgets.QGroupBox("Selected files")
-        self.ddlstLayout = QtWidgets.QVBoxLayout()
+        if generation != self.scangeneration:
+            return None
+        self.scanjob = None
+        TRACER.record("scan", self.scanstart, time.perf_counter(), folder=self.folderpath)
+
+        for folder in [i for i in self.folderitems if i not in self.scannedfolders]:
+            parent = self.folderitems.pop(folder)
+            for child in [parent.child(j) for j in range(parent.childCount())]:
+                self.removeFileItem(child)
+            self.tree.takeTopLevelItem(self.tree.indexOfTopLevelItem(parent))
+
+        self.folderindex.setFiles({str(folder): filenames for folder, filenames in self.scannedfolders.items()})
+        self.indexjob = IndexJob(generation, self.folderindex, self.loader)
+        self.indexjob.signals.batch.connect(self.indexUpdated)
+        self.indexjob.signals.finished.connect(self.indexFinished)
+        QtCore.QThreadPool.globalInstance().start(self.indexjob)
+        self.statusBar().showMessage(f"{self.folderpath}: {self.tree.topLevelItemCount()} folders with .csv files")
+
+    def indexUpdated(self, generation, records):
+        """
+        stores the metadata of indexed files and shows it in the tree
 
-        self.ddlst = QtWidgets.QListWidget()
-        self.ddlst.setDragDropMode(QtWidgets.QAbstractItemView.DragOnly)
-        self.ddlst.setDefaultDropAction(QtCore.Qt.CopyAction)
-        self.ddlst.doubleClicked.connect(lambda: self.ddlst.takeItem(self.ddlst.currentRow()))
+        connected with IndexJob.signals.batch
+        """
+        if generation != self.scangeneration:
+            return None
+        self.folderindex.update(records)
+        for path, info in records:
+            child = self.treeitems.get(Path(path))
+            if child is not None:
+                self.setFileColumns(child, info)
+        if parseFilter(self.treeFilter.text())[1]:
+            self.filterTree(self.treeFilter.text())
+
+    def indexFinished(self, generation):
+        """
+        connected with IndexJob.signals.finished
+        """
+        if generation != self.scangeneration:
+            return None
+        self.indexjob = None
+        indexed = sum(info.size is not None for info in self.folderindex.files.values())
+        self.statusBar().showMessage(f"{self.folderpath}: {self.tree.topLevelItemCount()} folders with .csv files, "
+                                     f"{indexed} files indexed" + (f" (not saved: {self.folderindex.error})"
+                                                                   if self.folderindex.error else ""))
 
-        self.ddlstLayout = QtWidgets.QVBoxLayout()
-        self.ddlstLayout.addWidget(self.ddlst)
-        self.ddlstGroupBox.setLayout(self.ddlstLayout)
-        self.ExplorerLayout.addWidget(self.ddlstGroupBox)
+    def populateFolder(self, parent):
+        """
+        creates the file items of a folder item, with the check state of the folder
+        file items not matching the filter (treeFilter) are hidden
 
-    def DragDropList(self):
+        connected with tree.itemExpanded, called by check_status
         """
-        Creates Drag and Drop List from selected files of tree
+        self.requestSparklines()
+        filenames = parent.data(0, UNPOPULATED_ROLE)
+        if filenames is None:
+            return None
+        parent.setData(0, UNPOPULATED_ROLE, None)
+
+        hits = self.filterHits(self.treeFilter.text())
+        start = self.fileindex.starts[parent.data(0, FOLDER_ROLE)]
+        state = parent.checkState(0)
+        for fileid, filename in enumerate(filenames, start):
+            child = self.addFileItem(parent, filename, fileid, state)
+            child.setHidden(hits is not None and fileid not in hits)
 
-        called by check_status
+    def check_status(self, item):
         """
-        self.ddlst.clear()
-        self.filedict = {}
-        for file in self.filelst:
-            item = QtWidgets.QListWidgetItem(file.stem)
-            self.filedict[file.stem] = file
-            self.ddlst.addItem(item)
-        self.ddlst.repaint()
+        starts when the check state of an item of the tree changes (also of the file items of a checked folder)
+        a checked folder creates its file items, which are checked with it
+        the changes of the selected files are collected and applied to DragDropList at once -> applySelection
 
-    def _createSubplots(self):
+        connected with tree.itemChanged
         """
-        Creates subplot explorer layout
+        if item.parent() is None:
+            if item.checkState(0) == Qt.Checked:
+                self.populateFolder(item)
+            return None
+
+        path = item.data(0, Qt.UserRole)
+        checked = item.checkState(0) == Qt.Checked
+        if path is None or (checked == (path in self.filelst) and path not in self.selectionchanges):
+            return None
+        self.selectionchanges[path] = checked
+        self.selectionTimer.start(0)
+
+    def applySelection(self):
         """
-        self.SubplotLayout = QtWidgets.QVBoxLayout()
-        self.subplotGroupBox = QtWidgets.QGroupBox("Subplots")
-        self._createSpinBox()
-        self._createSubplotList()
-        self.subplotGroupBox.setLayout(self.SubplotLayout)
-        self.ExplorerLayout.addWidget(self.subplotGroupBox)
+        adds the newly checked files to / removes the unchecked files from DragDropList (no rebuild)
 
-    def _createSpinBox(self):
+        connected with selectionTimer
         """
-        Creates spinbox to select number of subplots
+        changes, self.selectionchanges = self.selectionchanges, {}
+        for path, checked in changes.items():
+            if checked and path not in self.filelst:
+                self.filelst[path] = item = QtWidgets.QListWidgetItem(path.stem)
+                item.setData(Qt.UserRole, path)
+                self.ddlst.addItem(item)
+                self.filedict[path.stem] = path
+            elif not checked and path in self.filelst:
+                self.unselectFile(path)
+
+    def unselectFile(self, path):
         """
-        self.spinBox = QtWidgets.QSpinBox()
-        self.spinBox.setValue(1)
-        self.spinBox.valueChanged.connect(self.getSpinBoxvalue)
+        removes file from DragDropList and unchecks it in the tree
+
+        called by applySelection and by a doubleclick in DragDropList
+        """
+        item = self.filelst.pop(path, None)
+        if item is not None:
+            self.ddlst.takeItem(self.ddlst.row(item))
+        if self.filedict.get(path.stem) == path:
+            del self.filedict[path.stem]
+        if path in self.treeitems and self.treeitems[path].checkState(0) != Qt.Unchecked:
+            self.treeitems[path].setCheckState(0, Qt.Unchecked)
+
+    def filterHits(self, text):
+        """
+        returns the ids (FilenameIndex) of the files matching the text of the tree filter, None without filter
+        text: part of the file name and conditions on the columns of the FolderIndex (see parseFilter)
+        """
+        name, conditions = parseFilter(text)
+        hits = self.fileindex.search(name) if name else None
+        if conditions:
+            ids = self.fileindex.ids
+            matches = {ids[path] for path in self.folderindex.query(conditions) if path in ids}
+            hits = matches if hits is None else hits & matches
+        return hits
+
+    def filterTree(self, text):
+        """
+        shows only the folders and files matching text (see filterHits)
+        the matching files are looked up in the FilenameIndex / FolderIndex, so the items are not searched
+
+        connected with treeFilter
+        """
+        hits = self.filterHits(text)
+        folders = None if hits is None else {self.fileindex.folders[i] for i in hits}
+        root = self.tree.invisibleRootItem()
+        for k in range(root.childCount()):
+            parent = root.child(k)
+            parent.setHidden(folders is not None and parent.data(0, FOLDER_ROLE) not in folders)
+            if parent.isHidden() or parent.data(0, UNPOPULATED_ROLE) is not None:
+                continue
+            for j in range(parent.childCount()):
+                child = parent.child(j)
+                child.setHidden(hits is not None and child.data(0, FILEID_ROLE) not in hits)
+        self.requestSparklines()
+
+    def requestSparklines(self, *args):
+        """
+        updates the sparkline previews of the visible items after scrolling / expanding has paused
+
+        connected with scrolling and inserting items of tree and ddlst, called by filterTree
+        """
+        if self.sparklineAct.isChecked():
+            self.sparklineTimer.start()
+
+    def visibleFileItems(self):
+        """
+        returns the file items of tree and ddlst within the visible area
+        """
+        items = []
+        item = self.tree.itemAt(0, 0)
+        while item is not None and self.tree.visualItemRect(item).top() < self.tree.viewport().height():
+            if item.parent() is not None:
+                items.append(item)
+            item = self.tree.itemBelow(item)
+
+        first = self.ddlst.indexAt(QtCore.QPoint(0, 0)).row()
+        last = self.ddlst.indexAt(QtCore.QPoint(0, self.ddlst.viewport().height() - 1)).row()
+        if first != -1:
+            items.extend(self.ddlst.item(i) for i in range(first, (self.ddlst.count() - 1 if last == -1 else last) + 1))
+        return items
+
+    def updateSparklines(self):
+        """
+        sets the sparkline previews of the visible file items: from memory, from the disk cache (SparklineCache)
+        or computed in the background (SparklineJob) -> sparklinesComputed
+        a running SparklineJob for items which are no longer visible is cancelled
+
+        connected with sparklineTimer
+        """
+        missing = {}
+        for item in self.visibleFileItems():
+            path = item.data(0, Qt.UserRole) if isinstance(item, QtWidgets.QTreeWidgetItem) else item.data(Qt.UserRole)
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except (OSError, TypeError):
+                continue
+            if self.sparklines.get(path, (None,))[0] == mtime:
+                self.setSparkline(item, mtime, self.sparklines[path][1])
+            else:
+                missing[str(path)] = mtime
+
+        for path, preview in self.sparklinecache.get(missing).items():
+            self.sparklinesComputed([(path, missing.pop(path), preview)], cache=False)
+        self.sparklineCacheError()
+
+        if self.sparklinejob is not None:
+            self.sparklinejob.cancel()
+            self.sparklinejob = None
+        if missing:
+            self.sparklinegeneration += 1
+            self.sparklinejob = SparklineJob(self.sparklinegeneration, list(missing.items()), self.delimiter)
+            self.sparklinejob.signals.batch.connect(self.sparklinesComputed)
+            self.sparklinejob.signals.finished.connect(self.sparklinesFinished)
+            QtCore.QThreadPool.globalInstance().start(self.sparklinejob)
+
+    def sparklinesComputed(self, records, cache=True):
+        """
+        draws the sparkline previews [(path, mtime, preview), ...] and sets them on the items of the files
+        with cache, the previews are stored in the SparklineCache
+
+        connected with SparklineJob.signals.batch, called by updateSparklines
+        """
+        if cache:
+            self.sparklinecache.put(records)
+            self.sparklineCacheError()
+        if not self.sparklineAct.isChecked():
+            return None
+        color = self.palette().color(QtGui.QPalette.Text)
+        for path, mtime, preview in records:
+            path = Path(path)
+            self.sparklines[path] = (mtime, sparklineIcon(preview, SPARKLINE_SIZE, color))
+            for item in (self.treeitems.get(path), self.filelst.get(path)):
+                if item is not None:
+                    self.setSparkline(item, mtime, self.sparklines[path][1])
+
+    def sparklineCacheError(self):
+        """
+        shows a failed read or write of the SparklineCache in the statusbar (previews are computed anyway)
+
+        called by updateSparklines, sparklinesComputed
+        """
+        if self.sparklinecache.error is not None:
+            self.statusBar().showMessage(self.sparklinecache.error)
+            self.sparklinecache.error = None
+
+    def sparklinesFinished(self, generation):
+        """
+        connected with SparklineJob.signals.finished
+        """
+        if generation == self.sparklinegeneration:
+            self.sparklinejob = None
+
+    def setSparkline(self, item, mtime, icon):
+        """
+        sets icon as preview of a tree or ddlst item (if its file has changed since)
+        """
+        if isinstance(item, QtWidgets.QTreeWidgetItem):
+            if item.data(0, SPARKLINE_ROLE) != mtime:
+                item.setData(0, SPARKLINE_ROLE, mtime)
+                item.setIcon(0, icon)
+        elif item.data(SPARKLINE_ROLE) != mtime:
+            item.setData(SPARKLINE_ROLE, mtime)
+            item.setIcon(icon)
+
+    def enableSparklines(self, enabled):
+        """
+        shows / removes the sparkline previews
+
+        connected with sparklineAct
+        """
+        self.settings.setValue("view/sparklines", enabled)
+        if enabled:
+            self.updateSparklines()
+            return None
+
+        if self.sparklinejob is not None:
+            self.sparklinejob.cancel()
+            self.sparklinejob = None
+        self.sparklines = {}
+        for item in self.treeitems.values():
+            item.setData(0, SPARKLINE_ROLE, None)
+            item.setIcon(0, QtGui.QIcon())
+        for item in self.filelst.values():
+            if item is not None:
+                item.setData(SPARKLINE_ROLE, None)
+                item.setIcon(QtGui.QIcon())
+
+    def _createDragDropList(self):
+        """
+        Layout to show selected files
+            functions
+                - change order (drag & drop)
+                - remove items with doubleclick
+        sublayout of Explorer
+        """
+        self.ddlstGroupBox = QtWidgets.QGroupBox("Selected files")
+        self.ddlstLayout = QtWidgets.QVBoxLayout()
+
+        self.ddlst = QtWidgets.QListWidget()
+        self.ddlst.setDragDropMode(QtWidgets.QAbstractItemView.DragOnly)
+        self.ddlst.setDefaultDropAction(QtCore.Qt.CopyAction)
+        self.ddlst.itemDoubleClicked.connect(lambda item: self.unselectFile(item.data(Qt.UserRole)))
+        self.ddlst.setIconSize(QtCore.QSize(*SPARKLINE_SIZE))
+        self.ddlst.verticalScrollBar().valueChanged.connect(self.requestSparklines)
+        self.ddlst.model().rowsInserted.connect(self.requestSparklines)
+
+        self.ddlstLayout = QtWidgets.QVBoxLayout()
+        self.ddlstLayout.addWidget(self.ddlst)
+        self.ddlstGroupBox.setLayout(self.ddlstLayout)
+        self.ExplorerLayout.addWidget(self.ddlstGroupBox)
+
+    def DragDropList(self):
+        """
+        Creates Drag and Drop List from selected files (filelst)
+
+        called by openSession
+        """
+        self.ddlst.clear()
+        self.filedict = {}
+        for file in self.filelst:
+            item = QtWidgets.QListWidgetItem(file.stem)
+            item.setData(Qt.UserRole, file)
+            self.filelst[file] = item
+            self.filedict[file.stem] = file
+            self.ddlst.addItem(item)
+        self.ddlst.repaint()
+
+    def _createSubplots(self):
+        """
+        Creates subplot explorer layout
+        """
+        self.SubplotLayout = QtWidgets.QVBoxLayout()
+        self.subplotGroupBox = QtWidgets.QGroupBox("Subplots")
+        self._createSpinBox()
+        self._createSubplotList()
+        self.subplotGroupBox.setLayout(self.SubplotLayout)
+        self.ExplorerLayout.addWidget(self.subplotGroupBox)
+
+    def _createSpinBox(self):
+        """
+        Creates spinbox to select number of subplots
+        """
+        self.spinBox = QtWidgets.QSpinBox()
+        self.spinBox.setValue(1)
+        self.spinBox.valueChanged.connect(self.getSpinBoxvalue)
 
         self.NsubplotsLayout = QtWidgets.QHBoxLayout()
         self.NsubplotsLabel = QtWidgets.QLabel("Number of subplots")
@@ -599,6 +1918,7 @@ class ApplicationWindow(QtWidgets.QMainWindow):
         self.Nsubplots = self.spinBox.value()
         [self.SubplotLayout.removeWidget(i) for i in self.subplotList]
         self._createSubplotList()
+        self.invalidate("order")
 
     def _createSubplotList(self):
         """
@@ -614,12 +1934,14 @@ class ApplicationWindow(QtWidgets.QMainWindow):
             self.subplotList[i].setDefaultDropAction(QtCore.Qt.MoveAction)
 
             self.subplotList[i].doubleClicked.connect(self.removeItem2)
-            self.subplotList[i].model().rowsMoved.connect(self.updateSubplotOrder)
+            self.subplotList[i].model().rowsMoved.connect(lambda *args: self.invalidate("order"))
             self.subplotList[i].model().rowsMoved.connect(self.deselectItem)
-            self.subplotList[i].model().rowsInserted.connect(self.updateSubplotOrder)
-            self.subplotList[i].model().rowsRemoved.connect(self.updateSubplotOrder)
-            self.subplotList[i].model().dataChanged.connect(self.updateSubplotOrder)
+            self.subplotList[i].model().rowsInserted.connect(lambda *args: self.invalidate("order"))
+            self.subplotList[i].model().rowsRemoved.connect(lambda *args: self.invalidate("order"))
+            self.subplotList[i].model().dataChanged.connect(lambda *args: self.invalidate("order"))
             self.subplotList[i].clicked.connect(lambda: [j.clearSelection() for j in self.subplotList])
+            self.subplotList[i].setContextMenuPolicy(Qt.CustomContextMenu)
+            self.subplotList[i].customContextMenuRequested.connect(lambda pos, j=i: self.subplotMenu(j, pos))
 
             self.SubplotListLayout.addWidget(self.subplotList[i])
 
@@ -629,7 +1951,7 @@ class ApplicationWindow(QtWidgets.QMainWindow):
         """
         update order of subplots, linked to subplotList (updates if changed)
 
-        connected with various subplotList functions (rowsMoved, rowsInserted, rowsRemoved, dataChanged)
+        scheduled by various subplotList functions (rowsMoved, rowsInserted, rowsRemoved, dataChanged)
         """
         self.filelistoflist = []
 
@@ -637,8 +1959,74 @@ class ApplicationWindow(QtWidgets.QMainWindow):
             keylist = [j.item(i).text() for i in range(j.count())]
             self.filelistoflist.append([self.filedict[i] for i in keylist if i in self.filedict])
 
+        # columns of added subplots
+        self.columns = (self.columns + [DEFAULT_COLUMNS] * len(self.subplotList))[:len(self.subplotList)]
         self.readData()
 
+    def channelLists(self):
+        """
+        Channels of every subplot: all files of the subplot with its columns (x, y of every y column)
+        """
+        return [[Channel(file, x, y) for file in filelist for y in ycolumns]
+                for filelist, (x, ycolumns) in zip(self.filelistoflist, self.columns)]
+
+    def subplotMenu(self, j, pos):
+        """
+        context menu of subplotList j
+
+        connected with subplotList.customContextMenuRequested
+        """
+        menu = QtWidgets.QMenu(self)
+        menu.addAction("&Columns...", lambda: self.pickColumns(j))
+        menu.exec_(self.subplotList[j].viewport().mapToGlobal(pos))
+
+    def pickColumns(self, j):
+        """
+        selects the x column and the plotted y columns of subplot j
+        the column names are taken from the header metadata of the files (ColumnIndex), so the
+        dialog usually opens without reading any file
+
+        called from subplotMenu
+        """
+        names = []
+        for file in self.filelistoflist[j] if j < len(self.filelistoflist) else []:
+            with contextlib.suppress(OSError):
+                # longest header of the files
+                names += self.columnindex.get(file, self.delimiter)["names"][len(names):]
+        if len(names) < 2:
+            self.statusBar().showMessage("No files with several columns in this subplot")
+            return None
+        x, ycolumns = self.columns[j]
+
+        dialog = QtWidgets.QDialog(self)
+        dialog.setWindowTitle(f"Columns of subplot {j + 1}")
+        layout = QtWidgets.QFormLayout(dialog)
+
+        xBox = QtWidgets.QComboBox()
+        xBox.addItems(names)
+        xBox.setCurrentIndex(min(x, len(names) - 1))
+        yList = QtWidgets.QListWidget()
+        for i, name in enumerate(names):
+            item = QtWidgets.QListWidgetItem(name)
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Checked if i in ycolumns else Qt.Unchecked)
+            yList.addItem(item)
+        buttons = QtWidgets.QDialogButtonBox(QtWidgets.QDialogButtonBox.Ok | QtWidgets.QDialogButtonBox.Cancel)
+        buttons.accepted.connect(dialog.accept)
+        buttons.rejected.connect(dialog.reject)
+
+        layout.addRow("x", xBox)
+        layout.addRow("y", yList)
+        layout.addRow(buttons)
+        if dialog.exec_() != QtWidgets.QDialog.Accepted:
+            return None
+
+        x = xBox.currentIndex()
+        ycolumns = tuple(i for i in range(yList.count()) if yList.item(i).checkState() == Qt.Checked and i != x)
+        if ycolumns and (x, ycolumns) != self.columns[j]:
+            self.columns[j] = (x, ycolumns)
+            self.invalidate("order")
+
     def removeItem2(self):
         """
         delete items of subplotLists by doubleclicking
@@ -649,7 +2037,7 @@ class ApplicationWindow(QtWidgets.QMainWindow):
             i.takeItem(i.currentRow())
             i.setCurrentRow(-1)
 
-        self.updateSubplotOrder()
+        self.invalidate("order")
 
     def deselectItem(self):
         """
@@ -663,136 +2051,3103 @@ class ApplicationWindow(QtWidgets.QMainWindow):
 
     def readData(self):
         """
-        read Data from selected files
-        updates plot
+        read Data from selected files in the background (LoadJob)
+        a running load is cancelled, only the latest generation of data updates the plot -> dataLoaded
 
         called by updateSubplotOrder
         """
 
-        # set delimiter
-        if self.commaAct.isChecked():
+        # set delimiter (None: detect delimiter of each file)
+        if self.autoAct.isChecked():
+            self.delimiter = None
+        elif self.commaAct.isChecked():
             self.delimiter = ","
         else:
             self.delimiter = ";"
 
-        if self.filelistoflist:
-            self.datalst = []
-            self.Xlist = []
-            self.Ylist = []
-            self.LEGENDS = []
-            for j in range(self.Nsubplots):
-                self.datalst.append({index: np.genfromtxt(i, delimiter=self.delimiter, names=["x", "y"])
-                                     for index, i in enumerate(self.filelistoflist[:][j])})
+        if self.loadjob is not None:
+            self.loadjob.cancel()
+            self.loadjob = None
+
+        if not self.filelistoflist:
+            self.Update()
+            return None
+
+        self.generation += 1
+        self.loadjob = LoadJob(self.generation, self.channelLists(), self.delimiter,
+                               self.cache, self.parseFile, self.lodAct.isChecked())
+        self.loadjob.signals.progress.connect(self.loadProgress)
+        self.loadjob.signals.partial.connect(self.partialLoaded)
+        self.loadjob.signals.finished.connect(self.dataLoaded)
+        self.loadjob.signals.failed.connect(self.loadFailed)
+        self.pool.start(self.loadjob)
+
+    def loadProgress(self, generation, done, total):
+        """
+        shows progress of the latest LoadJob
+
+        connected with LoadJob.signals.progress
+        """
+        if generation != self.generation:
+            return None
+        self.progressBar.setMaximum(total)
+        self.progressBar.setValue(done)
+        self.progressBar.setVisible(done < total)
+
+    def partialLoaded(self, generation, channellists, data, overview):
+        """
+        plots the channels loaded so far and the overview of the file which is still being read
+        (channels not loaded yet are left out)
+
+        connected with LoadJob.signals.partial
+        """
+        if generation != self.generation:
+            return None
+        data = dict(data)
+        data.update({channel: self.store.entry(x, y) for channel, (x, y) in overview.items()})
+
+        self.store.set([[i for i in channellist if i in data] for channellist in channellists], data)
+        self.invalidate("data")
+
+    def dataLoaded(self, generation, channellists, data):
+        """
+        swaps in the loaded data and updates plot, results of outdated generations are dropped
+
+        connected with LoadJob.signals.finished
+        """
+        if generation != self.generation:
+            return None
+        self.loadjob = None
+        self.progressBar.setVisible(False)
+
+        self.store.set(channellists, data)
+        self.updateStatus()
+        self.invalidate("data")
+
+        if self.tailAct.isChecked():
+            self.livetail.setFiles(channelColumns(self.store.channels), self.delimiter, self.loadedOffsets())
+
+    def loadedOffsets(self):
+        """
+        returns {path: bytes parsed (complete lines)} of the plotted files (start of live tail)
+        """
+        return {channel.path: entry.offset for channel, entry in zip(self.store.channels, self.store.entries)
+                if entry.offset is not None}
+
+    def toggleLiveTail(self, enabled):
+        """
+        starts / stops watching the plotted files for appended rows
 
-                self.Xlist.append({i: self.datalst[j][i]["x"] for i in range(len(self.datalst[j]))})
-                self.Ylist.append({i: self.datalst[j][i]["y"] for i in range(len(self.datalst[j]))})
-                self.LEGENDS.append({i: file.stem for i, file in enumerate(self.filelistoflist[j])})
+        connected with tailAct
+        """
+        if enabled:
+            self.livetail.setFiles(channelColumns(self.store.channels), self.delimiter, self.loadedOffsets())
+        else:
+            self.livetail.setFiles([])
+
+    def tailUpdated(self, data):
+        """
+        appends the new rows of files to their data (or replaces the data of rewritten files),
+        the curves are updated in place
+
+        connected with LiveTail.updated
+        """
+        for channel, entry in zip(list(self.store.channels), list(self.store.entries)):
+            if channel.path not in data:
+                continue
+            columns, reset = data[channel.path]
+            if reset:
+                self.store.replace(channel, self.store.entry(columns[channel.x], columns[channel.y]))
+            else:
+                # the cached version of the file is outdated, the entry grows from now on
+                self.cache.drop(channel.path)
+                entry.append(columns[channel.x], columns[channel.y])
+        self.invalidate("data")
+
+    def loadFailed(self, generation, message):
+        """
+        shows error of the latest LoadJob in the statusbar
 
+        connected with LoadJob.signals.failed
+        """
+        if generation != self.generation:
+            return None
+        self.loadjob = None
+        self.progressBar.setVisible(False)
+        self.statusBar().showMessage(f"Loading failed: {message}")
 
-        self.Update()
+    def closeEvent(self, event):
+        """
+        cancels running LoadJob and IndexJob and saves the header metadata (ColumnIndex) before closing
+        """
+        if self.loadjob is not None:
+            self.loadjob.cancel()
+        if self.indexjob is not None:
+            self.indexjob.cancel()
+        self.columnindex.save()
+        super().closeEvent(event)
 
 
-class MatplotlibCanvas(FigureCanvasQTAgg):
+def nearestIndex(x, value, sortedx=True):
+    """
+    index of the value of x nearest to value (binary search if x is sorted), None if x is empty
     """
-    Class to create canvas for matplotlib subplots
+    if not len(x):
+        return None
+    if not sortedx:
+        return int(np.nanargmin(np.abs(x - value)))
 
-    inspired by https://www.pythonguis.com/tutorials/plotting-matplotlib/
+    i = int(np.searchsorted(x, value))
+    if i == len(x) or (i > 0 and value - x[i - 1] < x[i] - value):
+        i -= 1
+    return i
+
+
+class Tracer:
     """
+    Lightweight span timers of the hot paths (scan, parse, build, legend, draw, render)
 
-    def __init__(self, parent=None, dpi=120, nsubplots=2):
-        self.nsubplots = nsubplots
+    The duration of the last span of each name is kept for the statusbar. While recording,
+    all spans are collected as Chrome trace events (complete events, "ph": "X").
+    Spans can be recorded from worker threads.
+    """
 
-        # exception handling for 1 plot (no subplots)
-        if nsubplots == 1:
-            self.fig, self.axs = plt.subplots(1, 1)
-            self.axs.spines["top"].set_visible(False)
-            self.axs.spines["right"].set_visible(False)
+    SUMMARY = ("scan", "parse", "build", "legend", "draw", "render")
 
-        else:
-            self.fig, self.axs = plt.subplots(self.nsubplots, 1, sharex=True)
-            # self.fig.tight_layout()
-            self.fig.subplots_adjust(hspace=0.2)
-            for i in range(nsubplots):
-                self.axs[i].spines["top"].set_visible(False)
-                self.axs[i].spines["right"].set_visible(False)
+    def __init__(self):
+        self.last = {}
+        self.events = None
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def span(self, name, **args):
+        """
+        context manager timing the enclosed code
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter(), **args)
 
-                if i != nsubplots-1:
-                    self.axs[i].get_xaxis().set_visible(False)
-                    self.axs[i].spines['bottom'].set_visible(False)
+    def record(self, name, start, end, **args):
+        """
+        records a span measured with time.perf_counter (e.g. across signals)
+        """
+        self.last[name] = end - start
+        if self.events is not None:
+            with self._lock:
+                self.events.append({"name": name, "ph": "X", "ts": start * 1e6, "dur": (end - start) * 1e6,
+                                    "pid": os.getpid(), "tid": threading.get_ident(), "args": args})
 
-        super(MatplotlibCanvas, self).__init__(self.fig)
+    def startRecording(self):
+        with self._lock:
+            self.events = []
+
+    def stopRecording(self):
+        """
+        returns recorded trace events
+        """
+        with self._lock:
+            events, self.events = self.events or [], None
+        return events
+
+    def summary(self):
+        """
+        short description for the statusbar
+        """
+        return "last update: " + ", ".join(f"{i} {self.last[i] * 1000:.0f} ms" for i in self.SUMMARY if i in self.last)
+
+
+# timings of the hot paths
+TRACER = Tracer()
 
 
-class xkcdPlot(FigureCanvasQTAgg):
+def minmaxDecimate(x, y, npixels, chunk=None):
     """
-    Class to create canvas for matplotlib with xkcd style
-    https://matplotlib.org/stable/gallery/showcase/xkcd.html#sphx-glr-gallery-showcase-xkcd-py
+    reduces (x, y) to the min/max envelope of npixels chunks (2 points per chunk in original order)
+    with chunk, the chunk size is fixed instead (npixels is ignored)
+    """
+    if chunk is None:
+        chunk = len(x) // npixels
+    else:
+        npixels = len(x) // chunk
+    if chunk < 2:
+        return x, y
+
+    n = chunk * npixels
+    blocks = y[:n].reshape(npixels, chunk)
+    base = np.arange(npixels) * chunk
+    index = np.sort(np.concatenate([base + blocks.argmin(axis=1), base + blocks.argmax(axis=1)]))
+    if n < len(x):
+        # remaining points of the last chunk
+        index = np.concatenate([index, n + np.array([y[n:].argmin(), y[n:].argmax()])])
+    return x[index], y[index]
+
+
+def appendColumns(buffer, n, values):
+    """
+    writes values (rows x columns) behind the first n columns of buffer (None: no buffer yet)
+    returns buffer, or a copy with at least twice the capacity if values do not fit (amortized growth)
+    """
+    m = n + values.shape[1]
+    if buffer is None or m > buffer.shape[1]:
+        grown = np.empty((len(values), max(2 * n, m, 1024)), dtype=values.dtype if buffer is None else buffer.dtype)
+        if buffer is not None:
+            grown[:, :n] = buffer[:, :n]
+        buffer = grown
+    buffer[:, n:m] = values
+    return buffer
 
-    Based on "Stove Ownership" from XKCD by Randall Munroe    https://xkcd.com/418/
+
+class LODPyramid:
     """
+    Multi-resolution min/max envelopes of a curve with sorted x values (level of detail)
 
-    def __init__(self, parent=None, dpi=120):
-        with plt.xkcd():
+    Every level halves the number of points of the previous level (min/max of chunks of 4 points),
+    so view needs O(visible pixels) instead of O(points) to decimate the visible range.
+    """
 
-            self.fig = plt.figure()
-            self.ax = self.fig.add_axes((0.1, 0.2, 0.8, 0.7))
-            self.ax.spines.right.set_color('none')
-            self.ax.spines.top.set_color('none')
-            self.ax.set_xticks([])
-            self.ax.set_yticks([])
-            self.ax.set_ylim([-30, 10])
+    def __init__(self, x, y, minpoints=4096):
+        self.minpoints = minpoints
+        self.x = x
+        self.levels = [(x, y)]
+        while len(x) > minpoints:
+            x, y = minmaxDecimate(x, y, None, chunk=4)
+            self.levels.append((x, y))
+        self._buffers = [None] * len(self.levels)  # growing buffers of the levels (see extend)
+
+    @classmethod
+    def create(cls, x, y):
+        """
+        returns LODPyramid, None if x is not sorted
+        """
+        if len(x) and not np.all(x[1:] >= x[:-1]):
+            return None
+        return cls(x, y)
 
-            self.data = np.ones(100)
-            self.data[70:] -= np.arange(30)
+    @property
+    def nbytes(self):
+        """
+        memory of the levels above the curve
+        """
+        return sum(self._buffers[k].nbytes if self._buffers[k] is not None else x.nbytes + y.nbytes
+                   for k, (x, y) in enumerate(self.levels) if k > 0)
 
-            self.ax.annotate(
-                'THE DAY I REALIZED\nI COULD COOK BACON\nWHENEVER I WANTED',
-                xy=(70, 1), arrowprops=dict(arrowstyle='->'), xytext=(15, -10))
+    def extend(self, x, y):
+        """
+        updates the levels to (x, y), the curve of the pyramid with appended rows (live tail mode)
+        the envelopes of the complete chunks are kept, only the new points are decimated
+        """
+        stable = len(self.x)  # points at the start of the level that did not change
+        self.x = x
+        self.levels[0] = (x, y)
+        k = 0
+        while len(x) > self.minpoints:
+            k += 1
+            if k < len(self.levels):
+                start = 4 * (stable // 4)
+                buffer = self._buffers[k] if self._buffers[k] is not None else np.array(self.levels[k])
+            else:
+                start, buffer = 0, None
+                self.levels.append(None)
+                self._buffers.append(None)
+            stable = start // 2
+            values = np.array(minmaxDecimate(x[start:], y[start:], None, chunk=4))
+            self._buffers[k] = buffer = appendColumns(buffer, stable, values)
+            x, y = buffer[:, :stable + values.shape[1]]
+            self.levels[k] = (x, y)
+
+    def view(self, x0, x1, npixels):
+        """
+        min/max envelope of [x0, x1] (None: whole curve) with about 2 points per pixel
+        """
+        for x, y in reversed(self.levels):
+            i0 = 0 if x0 is None else max(np.searchsorted(x, x0) - 1, 0)
+            i1 = len(x) if x1 is None else min(np.searchsorted(x, x1, side="right") + 1, len(x))
+            if i1 - i0 >= 4 * npixels:
+                break
+        return minmaxDecimate(x[i0:i1], y[i0:i1], npixels)
 
-            self.ax.plot(self.data)
 
-            self.ax.set_xlabel('time')
-            self.ax.set_ylabel('my overall health')
+def exportCurve(curve, sortedx, x0, x1, npixels=None):
+    """
+    data of a curve (see MatplotlibCanvas.setCurve) shifted by its offsets for an export
+    with npixels, the visible range [x0, x1] is reduced to its min/max envelope of npixels columns
+    """
+    x, y, xoffset, yoffset, pyramid = curve
+    if npixels is not None:
+        if pyramid is not None:
+            x, y = pyramid.view(x0 - xoffset, x1 - xoffset, npixels)
+        else:
+            if sortedx:
+                i0 = max(np.searchsorted(x, x0 - xoffset) - 1, 0)
+                i1 = min(np.searchsorted(x, x1 - xoffset, side="right") + 1, len(x))
+                x, y = x[i0:i1], y[i0:i1]
+            x, y = minmaxDecimate(x, y, npixels)
+    return x + xoffset, y + yoffset
 
-            # self.fig.tight_layout()
-            super(xkcdPlot, self).__init__(self.fig)
 
+class CurveStats:
+    """
+    Statistics of a curve (ignoring NaN), computed once per DataEntry
 
-class myPlot(FigureCanvasQTAgg):
+    Used for the stacking offsets and the data limits of LineCollections.
     """
-    Nicolas favored plotting style
 
-    Adapted from https://visme.co/blog/funny-graphs/
+    def __init__(self, x, y):
+        self.n = len(x)
+        with warnings.catch_warnings():
+            # all-NaN or empty arrays
+            warnings.simplefilter("ignore", RuntimeWarning)
+            self.xmin, self.xmax = (np.nanmin(x), np.nanmax(x)) if len(x) else (np.nan, np.nan)
+            self.ymin, self.ymax = (np.nanmin(y), np.nanmax(y)) if len(y) else (np.nan, np.nan)
+
+    @classmethod
+    def merged(cls, stats, x, y):
+        """
+        returns CurveStats of a curve with stats (CurveStats or FileInfo) continued by (x, y)
+        """
+        merged = cls(x, y)
+        merged.n += stats.n
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            merged.xmin, merged.ymin = np.nanmin([[stats.xmin, stats.ymin], [merged.xmin, merged.ymin]], axis=0)
+            merged.xmax, merged.ymax = np.nanmax([[stats.xmax, stats.ymax], [merged.xmax, merged.ymax]], axis=0)
+        return merged
+
+
+def uniformAxis(x):
     """
-    def __init__(self, parent=None, dpi=120):
-        self.fig = plt.figure()
-        self.ax = self.fig.add_axes((0.1, 0.1, 0.8, 0.8))
-        self.ax.axis('off')
-        self.fig.suptitle("my charts and graphs are:", size=20)
+    returns (start, step, n) if the values of x increase uniformly (deviation below 1 % of step),
+    else None
+    """
+    n = len(x)
+    if n < 3:
+        return None
+    start = float(x[0])
+    step = (float(x[-1]) - start) / (n - 1)
+    if not step > 0:
+        return None
+    deviation = np.abs(x - (start + step * np.arange(n))).max()
+    return (start, step, n) if deviation < 0.01 * step else None
 
-        self.ax.arrow(0, 1, 0, -2, color='black', head_length=0.07, head_width=0.05, length_includes_head=True)
-        self.ax.arrow(0, -1, 0, 2, color='black', head_length=0.07, head_width=0.05, length_includes_head=True)
-        self.ax.arrow(1, 0, -2, 0, color='black', head_length=0.07, head_width=0.05, length_includes_head=True)
-        self.ax.arrow(-1, 0, 2, 0, color='black', head_length=0.07, head_width=0.05, length_includes_head=True)
 
-        self.ax.text(0.5, 1, 'Easy to comprehend', horizontalalignment='center', size=16,
-                     verticalalignment='center', transform=self.ax.transAxes)
-        self.ax.text(0.5, 0, 'Hard to comprehend', horizontalalignment='center', size=16,
-                     verticalalignment='center', transform=self.ax.transAxes)
-        self.ax.text(0, 0.5, 'Boring', horizontalalignment='center', size=16,
-                     verticalalignment='center', transform=self.ax.transAxes, rotation='vertical')
-        self.ax.text(1, 0.5, 'Fascinating', horizontalalignment='center', size=16,
-                     verticalalignment='center', transform=self.ax.transAxes, rotation=270)
+# curve of a data file: path and indices of the x and y column (see ApplicationWindow.channelLists)
+Channel = namedtuple("Channel", ["path", "x", "y"])
 
-        self.ax.plot(0.7, 0.7, 'co', markersize=20)
-        self.ax.text(0.62, 0.76, 'My perception', size=12)
-        self.ax.plot(-0.7, -0.7, 'mo', markersize=20)
-        self.ax.text(-0.78, -0.78, 'Everyone else', size=12)
 
-        super(myPlot, self).__init__(self.fig)
+def channelColumns(channels):
+    """
+    columns to read of every file of channels: {path: (x, y1, y2, ...)} (x column first)
+    """
+    columns = OrderedDict()
+    for channel in channels:
+        columns.setdefault(channel.path, [channel.x])
+        if channel.y not in columns[channel.path]:
+            columns[channel.path].append(channel.y)
+    return {path: tuple(i) for path, i in columns.items()}
+
+
+class DataEntry:
+    """
+    Data of a file (x, y) with CurveStats and LODPyramid (created by LoadJob or updateCurves)
+
+    With float32, the arrays are stored as float32. With uniform, uniformly spaced x values are
+    stored as (start, step, n) and the array is created on access; it is shared by all users
+    (canvas, LODPyramid) as long as one of them holds it. Known stats (e.g. FileInfo of the
+    FolderIndex) are not computed again.
+    """
+
+    def __init__(self, x, y, float32=False, uniform=False, stats=None):
+        dtype = np.float32 if float32 else np.float64
+        self.n = len(y)
+        self.stats = CurveStats(x, y) if stats is None else stats
+        self.pyramid = None
+        self.source = None  # [size, mtime_ns] of the parsed file (see ApplicationWindow.parseFile)
+        self.offset = None  # bytes of the file that were parsed (complete lines, start of live tail)
+        self.axis = uniformAxis(x) if uniform else None
+        self._x = np.asarray(x, dtype=dtype) if self.axis is None else None
+        self._xref = None  # weak reference to the array created from axis
+        self._buffer = None  # growing buffer of the rows (x, y) or (y,) with axis (see append)
+        self.y = np.asarray(y, dtype=dtype)
+
+    @property
+    def x(self):
+        if self.axis is None:
+            return self._x
+        x = None if self._xref is None else self._xref()
+        if x is None:
+            start, step, n = self.axis
+            x = (start + step * np.arange(n)).astype(self.y.dtype, copy=False)
+            self._xref = weakref.ref(x)
+        return x
+
+    @property
+    def nbytes(self):
+        """
+        memory of the stored arrays (used by DataCache)
+        """
+        if self._buffer is not None:
+            return self._buffer.nbytes
+        return self.y.nbytes + (0 if self._x is None else self._x.nbytes)
+
+    def append(self, x, y):
+        """
+        appends rows (live tail mode): the arrays grow in place (amortized), stats and LODPyramid
+        are extended instead of computed again
+        """
+        n, m = self.n, len(y)
+        if not m:
+            return None
+        self.stats = CurveStats.merged(self.stats, x, y)
+        x = np.asarray(x, dtype=self.y.dtype)
+        y = np.asarray(y, dtype=self.y.dtype)
+        previous = self.x[-1] if n else None
+        self.source = self.offset = None  # the rows no longer match a parsed version of the file
+
+        if self.axis is not None:
+            start, step, _ = self.axis
+            if not np.abs(x - (start + step * np.arange(n, n + m))).max() < 0.01 * step:
+                # not uniform anymore
+                self._x, self.axis = self.x, None
+        if self.axis is not None:
+            self.axis = (start, step, n + m)
+            self._xref = None
+            rows = [y]
+        else:
+            rows = [x, y]
+        if self._buffer is None or len(self._buffer) != len(rows):
+            self._buffer = np.array([self.y] if self.axis is not None else [self._x, self.y])
+        self._buffer = appendColumns(self._buffer, n, np.array(rows))
+        self.n = n + m
+        *columns, self.y = self._buffer[:, :self.n]
+        self._x = columns[0] if columns else None
+
+        if self.pyramid is not None:
+            if np.all(x[1:] >= x[:-1]) and (previous is None or x[0] >= previous):
+                self.pyramid.extend(self.x, self.y)
+            else:
+                self.pyramid = None
+
+    @property
+    def heldbytes(self):
+        """
+        memory currently held: stored arrays, x array created from axis and LODPyramid levels
+        """
+        x = None if self._xref is None else self._xref()
+        nbytes = self.nbytes + (0 if x is None else x.nbytes)
+        if self.pyramid is not None:
+            nbytes += self.pyramid.nbytes
+        return nbytes
+
+
+class DataStore:
+    """
+    Plotted data: one DataEntry per unique Channel (column of a file), subplots refer to the
+    entries by handle
+
+    Channels that are part of several subplots are stored once. float32 and uniform are the
+    storage options of new entries (see DataEntry).
+    """
+
+    def __init__(self, float32=False, uniform=True):
+        self.float32 = float32
+        self.uniform = uniform
+        self.entries = []  # handle -> DataEntry
+        self.channels = []  # handle -> Channel
+        self.handles = {}  # Channel -> handle
+        self.subplots = []  # handles of the curves of every subplot
+
+    def entry(self, x, y, stats=None):
+        """
+        returns DataEntry of (x, y) with the options of the store
+        """
+        return DataEntry(x, y, self.float32, self.uniform, stats)
+
+    def set(self, channellists, data):
+        """
+        replaces all data, data: dict Channel -> DataEntry of all channels of channellists
+        """
+        self.channels = list(data)
+        self.entries = [data[i] for i in self.channels]
+        self.handles = {channel: handle for handle, channel in enumerate(self.channels)}
+        self.subplots = [[self.handles[i] for i in channellist] for channellist in channellists]
+
+    def replace(self, channel, entry):
+        """
+        replaces the DataEntry of a plotted channel (in all subplots)
+        """
+        if channel in self.handles:
+            self.entries[self.handles[channel]] = entry
+
+    def channellist(self, j):
+        return [self.channels[i] for i in self.subplots[j]]
+
+    def curves(self, j):
+        """
+        DataEntries of the curves of subplot j
+        """
+        return [self.entries[i] for i in self.subplots[j]]
+
+    @property
+    def nbytes(self):
+        return sum(i.heldbytes for i in self.entries)
+
+    def summary(self):
+        """
+        short description for the statusbar (memory held compared to float64 arrays of x and y)
+        """
+        full = sum(16 * i.n for i in self.entries)
+        nbytes = self.nbytes
+        return (f"Data: {len(self.entries)} curves, {nbytes / 2**20:.1f} MB"
+                + (f" ({100 * nbytes / full:.0f} %)" if full else ""))
+
+
+def writeSession(path, meta, channels, entries):
+    """
+    writes a session file: compressed .npz with the metadata (JSON, "session") and the data
+    of every Channel (x0, y0, x1, y1, ...; uniform x axes as axis0 = [start, step, n])
+    channels are stored as [path, version of the source ([size, mtime_ns]) the data was parsed
+    from, x column, y column]
+
+    the file is written to a temporary file first, so an existing session is never left broken
+    """
+    meta = dict(meta, files=[])
+    arrays = {}
+    for i, (channel, entry) in enumerate(zip(channels, entries)):
+        source = entry.source
+        if source is None:
+            # e.g. data of live tail mode
+            with contextlib.suppress(OSError):
+                stat = os.stat(channel.path)
+                source = [stat.st_size, stat.st_mtime_ns]
+        meta["files"].append([str(channel.path), source, channel.x, channel.y])
+
+        if entry.axis is None:
+            arrays[f"x{i}"] = entry.x
+        else:
+            arrays[f"axis{i}"] = np.array(entry.axis, dtype=float)
+        arrays[f"y{i}"] = entry.y
+    arrays["session"] = np.array(json.dumps(meta))
+
+    temp = Path(f"{path}.tmp")
+    with open(temp, "wb") as f:
+        np.savez_compressed(f, **arrays)
+    os.replace(temp, path)
+
+
+def readSession(path):
+    """
+    reads a session file (see writeSession)
+    returns (metadata, [(x, y) of every channel of metadata["files"]])
+    """
+    with np.load(path, allow_pickle=False) as npz:
+        meta = json.loads(npz["session"].item())
+        data = []
+        for i in range(len(meta["files"])):
+            if f"axis{i}" in npz.files:
+                start, step, n = npz[f"axis{i}"]
+                x = start + step * np.arange(int(n))
+            else:
+                x = npz[f"x{i}"]
+            data.append((x, npz[f"y{i}"]))
+    return meta, data
+
+
+class DiskCache:
+    """
+    Binary cache of parsed data files in a folder
+
+    Every entry is a .npy file with the array [x, y], which is opened memory-mapped (read only),
+    so loading needs no text parsing and no copy; the OS page cache is shared between repeated
+    loads and several instances of the application. A .json file next to it describes the source.
+    Entries are keyed by (path, size, mtime, delimiter); prune removes entries of changed or
+    deleted sources and the least recently used entries exceeding maxbytes.
+    """
+
+    def __init__(self, folder=DISK_CACHE_FOLDER, maxbytes=DISK_CACHE_LIMIT_MB * 2**20):
+        self.folder = Path(folder)
+        self.maxbytes = maxbytes
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+        self._nbytes = None  # size of all entries, None: unknown
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def source(path):
+        """
+        description of the source file, an entry is outdated if it changes
+        """
+        stat = os.stat(path)
+        return {"path": str(Path(path).resolve()), "size": stat.st_size, "mtime": stat.st_mtime_ns}
+
+    def _entry(self, source, delimiter, columns=(0, 1)):
+        key = [source["path"], source["size"], source["mtime"], delimiter]
+        if columns != (0, 1):
+            key.append(columns)
+        return self.folder / hashlib.sha1(json.dumps(key).encode()).hexdigest()
+
+    def get(self, path, delimiter, parser, columns=(0, 1)):
+        """
+        returns memory-mapped arrays of the columns (x, y1, y2, ...) of path,
+        parser(path, delimiter) is only called on a cache miss
+        """
+        columns = tuple(columns)
+        source = self.source(path)
+        entry = self._entry(source, delimiter, columns)
+        try:
+            data = np.load(entry.with_suffix(".npy"), mmap_mode="r")
+            if len(data) != len(columns):
+                raise ValueError
+            os.utime(entry.with_suffix(".json"))  # least recently used
+            self.hits += 1
+            return tuple(data)
+        except (OSError, ValueError):
+            self.misses += 1
+
+        arrays = parser(path, delimiter)
+        try:
+            nbytes = self._write(entry, source, arrays)
+        except OSError:
+            return arrays
+
+        with self._lock:
+            self._nbytes = self._size() if self._nbytes is None else self._nbytes + nbytes
+            if self._nbytes > self.maxbytes:
+                self._prunesize()
+
+        data = np.load(entry.with_suffix(".npy"), mmap_mode="r")
+        return tuple(data)
+
+    def _write(self, entry, source, arrays):
+        """
+        writes entry atomically (temporary file + rename), safe for several instances
+        the arrays are written into a memory-mapped file, so large files are not copied in memory
+        returns size of the data (bytes)
+        """
+        self.folder.mkdir(parents=True, exist_ok=True)
+        tmp = entry.with_name(f"{entry.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        data = np.lib.format.open_memmap(tmp, mode="w+", dtype=float, shape=(len(arrays), len(arrays[0])))
+        for i, array in enumerate(arrays):
+            data[i] = array
+        data.flush()
+        nbytes = data.nbytes
+        del data
+        os.replace(tmp, entry.with_suffix(".npy"))
+        entry.with_suffix(".json").write_text(json.dumps(source))
+        return nbytes
+
+    def _entries(self):
+        """
+        list of (entry, source, last access, size) of all entries
+        """
+        entries = []
+        for meta in self.folder.glob("*.json"):
+            try:
+                npy = meta.with_suffix(".npy")
+                entries.append((meta.with_suffix(""), json.loads(meta.read_text()), meta.stat().st_mtime,
+                                npy.stat().st_size))
+            except (OSError, ValueError):
+                self._remove(meta.with_suffix(""))
+        return entries
+
+    def _size(self):
+        return sum(i[3] for i in self._entries())
+
+    def _remove(self, entry):
+        for suffix in (".npy", ".json"):
+            try:
+                entry.with_suffix(suffix).unlink()
+            except OSError:
+                pass  # e.g. still memory-mapped on Windows
+
+    def _prunesize(self):
+        entries = sorted(self._entries(), key=lambda i: i[2])
+        self._nbytes = sum(i[3] for i in entries)
+        for entry, source, atime, nbytes in entries:
+            if self._nbytes <= self.maxbytes:
+                break
+            self._remove(entry)
+            self._nbytes -= nbytes
+
+    def prune(self):
+        """
+        removes entries of changed or deleted sources and least recently used entries exceeding maxbytes
+        """
+        with self._lock:
+            for entry, source, atime, nbytes in self._entries():
+                try:
+                    outdated = self.source(source["path"]) != source
+                except OSError:
+                    outdated = True
+                if outdated:
+                    self._remove(entry)
+            self._prunesize()
+
+    def clear(self):
+        with self._lock:
+            for entry, source, atime, nbytes in self._entries():
+                self._remove(entry)
+            self._nbytes = 0
+
+    def summary(self):
+        """
+        short description for the statusbar
+        """
+        if not self.enabled:
+            return "Disk cache: off"
+        return f"Disk cache: {self.hits} hits, {self.misses} misses"
+
+
+class TailReader:
+    """
+    Reads the rows appended to a data file since the last read
+
+    Reading starts at offset (e.g. the end of the lines parsed when the file was loaded), only
+    complete lines are parsed; lines which cannot be parsed are skipped. The rows of the last read
+    are in data. If the file gets shorter (rewritten), it is read again from the start and reset is
+    set: data then replaces all rows instead of continuing them.
+    """
+
+    def __init__(self, path, delimiter=None, columns=(0, 1), offset=0):
+        self.path = path
+        self.delimiter = delimiter
+        self.columns = tuple(columns)
+        self.offset = offset  # bytes parsed
+        self.reset = offset == 0  # data of the last read starts at the beginning of the file
+        self.data = {}  # {column: array} of the rows of the last read
+
+    def read(self):
+        """
+        parses appended lines, returns number of new rows
+        """
+        size = os.path.getsize(self.path)
+        self.reset = size < self.offset or self.offset == 0
+        if size < self.offset:
+            self.offset = 0
+        if size == self.offset:
+            return 0
+
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            chunk = f.read(size - self.offset)
+
+        end = chunk.rfind(b"\n") + 1
+        if end == 0:
+            return 0
+        text = chunk[:end].decode("latin-1")
+
+        if self.delimiter is None:
+            self.delimiter = sniffDelimiter(self.path)
+        self.offset += end
+        try:
+            rows = parseColumns(text, self.delimiter, self.columns)
+        except ValueError:
+            # broken lines (e.g. too few columns) are skipped, so reading goes on behind them
+            rows = []
+            for line in text.splitlines(keepends=True):
+                with contextlib.suppress(ValueError):
+                    rows.append(parseColumns(line, self.delimiter, self.columns))
+            rows = np.concatenate(rows) if rows else np.empty((0, len(self.columns)))
+        self.data = dict(zip(self.columns, rows.T))
+        return len(rows)
+
+
+class TailJobSignals(QtCore.QObject):
+    """
+    Signals of TailJob
+    """
+    finished = QtCore.pyqtSignal(object)  # {path: (TailReader, {column: array}, reset)} of files with new rows
+
+
+class TailJob(QtCore.QRunnable):
+    """
+    Reads appended rows of several TailReaders in a worker thread
+    """
+
+    def __init__(self, readers):
+        super().__init__()
+        self.readers = readers
+        self.signals = TailJobSignals()
+
+    def run(self):
+        data = {}
+        for reader in self.readers:
+            try:
+                if reader.read():
+                    data[reader.path] = (reader, reader.data, reader.reset)
+            except (OSError, ValueError):
+                continue
+        self.signals.finished.emit(data)
+
+
+class LiveTail(QtCore.QObject):
+    """
+    Watches data files for appended rows (live tail mode)
+
+    Changes are noticed by QFileSystemWatcher and by polling the file sizes (fallback, e.g. for
+    network shares). The appended rows are read by a TailJob; the plot is refreshed at most every
+    interval (ms) and never while the previous TailJob is running, so a fast writer cannot
+    starve the GUI. A file is read from the end of the lines parsed when it was loaded (or
+    completely, if unknown).
+    """
+
+    updated = QtCore.pyqtSignal(object)  # {path: ({column: array} of new rows, reset)}
+
+    def __init__(self, pool, interval=TAIL_INTERVAL_MS, poll=TAIL_POLL_MS, parent=None):
+        super().__init__(parent)
+        self.pool = pool
+        self.readers = {}
+        self.changed = set()
+        self.busy = False
+
+        self.watcher = QtCore.QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self._fileChanged)
+
+        self.polltimer = QtCore.QTimer(self)
+        self.polltimer.setInterval(poll)
+        self.polltimer.timeout.connect(self._poll)
+
+        self.refreshtimer = QtCore.QTimer(self)
+        self.refreshtimer.setSingleShot(True)
+        self.refreshtimer.setInterval(interval)
+        self.refreshtimer.timeout.connect(self._refresh)
+
+    def setFiles(self, files, delimiter=None, offsets=None):
+        """
+        watches files (and stops watching all others)
+        files: {path: columns to read} or paths (first two columns)
+        offsets: {path: bytes parsed when the file was loaded (see DataEntry.offset)}, rows behind it are new
+        """
+        if not isinstance(files, dict):
+            files = dict.fromkeys(files, (0, 1))
+        offsets = offsets or {}
+        for path in set(self.readers) - set(files):
+            self.watcher.removePath(str(path))
+            del self.readers[path]
+            self.changed.discard(path)
+
+        for path, columns in files.items():
+            reader = self.readers.get(path)
+            offset = offsets.get(path, 0)
+            if reader is not None and reader.columns == tuple(columns) and (not offset or reader.offset == offset):
+                continue
+            if reader is None:
+                self.watcher.addPath(str(path))
+            self.readers[path] = TailReader(path, delimiter, columns, offset)
+            self.changed.add(path)
+
+        if self.readers:
+            self.polltimer.start()
+            self._schedule()
+        else:
+            self.polltimer.stop()
+
+    def _fileChanged(self, path):
+        path = Path(path)
+        # a file replaced by the writer is no longer watched
+        if str(path) not in self.watcher.files() and path.exists():
+            self.watcher.addPath(str(path))
+        self.changed.add(path)
+        self._schedule()
+
+    def _poll(self):
+        for path, reader in self.readers.items():
+            try:
+                if os.path.getsize(path) != reader.offset:
+                    self.changed.add(path)
+            except OSError:
+                continue
+        self._schedule()
+
+    def _schedule(self):
+        if self.changed and not self.busy and not self.refreshtimer.isActive():
+            self.refreshtimer.start()
+
+    def _refresh(self):
+        readers = [self.readers[i] for i in self.changed if i in self.readers]
+        self.changed = set()
+        if not readers:
+            return None
+
+        self.busy = True
+        job = TailJob(readers)
+        job.signals.finished.connect(self._done)
+        self.pool.start(job)
+
+    def _done(self, data):
+        self.busy = False
+        # readers replaced meanwhile (e.g. data loaded again) are dropped
+        data = {path: (rows, reset) for path, (reader, rows, reset) in data.items() if self.readers.get(path) is reader}
+        if data:
+            self.updated.emit(data)
+        self._schedule()
+
+
+class UpdateScheduler(QtCore.QObject):
+    """
+    Collects invalidations (e.g. several signals of one drag & drop) and runs the callback
+    at most once per delay (ms) with the merged set of invalidations.
+    """
+
+    def __init__(self, callback, delay=UPDATE_DELAY_MS, parent=None):
+        super().__init__(parent)
+        self.callback = callback
+        self.pending = set()
+
+        # statistics
+        self.requests = 0
+        self.runs = 0
+        self.merged = 0
+
+        self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay)
+        self.timer.timeout.connect(self.flush)
+
+    def invalidate(self, *dirty):
+        """
+        adds invalidations, starts timer if no update is pending
+        """
+        self.requests += 1
+        if self.timer.isActive():
+            self.merged += 1
+        else:
+            self.timer.start()
+        self.pending.update(dirty)
+
+    def discard(self, *dirty):
+        """
+        drops pending invalidations (e.g. when the state was set directly)
+        """
+        self.pending.difference_update(dirty)
+
+    def flush(self):
+        """
+        runs pending invalidations immediately
+        """
+        self.timer.stop()
+        dirty, self.pending = self.pending, set()
+        self.runs += 1
+        self.callback(dirty)
+
+    def summary(self):
+        """
+        short description for the statusbar
+        """
+        return f"Updates: {self.requests} requested, {self.runs} run, {self.merged} merged"
+
+
+class ScanJobSignals(QtCore.QObject):
+    """
+    Signals of ScanJob
+    """
+    batch = QtCore.pyqtSignal(int, object)  # generation, [(folder, [csv file names]), ...]
+    finished = QtCore.pyqtSignal(int)  # generation
+
+
+class ScanJob(QtCore.QRunnable):
+    """
+    Walks a directory with os.scandir in a worker thread (same order as os.walk)
+
+    Folders containing .csv files are reported in batches (at most every interval seconds or
+    batchsize folders), so the tree fills while scanning. The job stops as soon as it is cancelled.
+    """
+
+    def __init__(self, generation, folderpath, batchsize=500, interval=0.1):
+        super().__init__()
+        self.generation = generation
+        self.folderpath = folderpath
+        self.batchsize = batchsize
+        self.interval = interval
+        self.signals = ScanJobSignals()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def run(self):
+        stack = [Path(self.folderpath)]
+        batch = []
+        last = time.monotonic()
+
+        while stack and not self._cancelled.is_set():
+            folder = stack.pop()
+            subfolders = []
+            filenames = []
+            try:
+                with os.scandir(folder) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir():
+                                if not entry.is_symlink():
+                                    subfolders.append(Path(entry.path))
+                            elif entry.name[-4:].lower() == ".csv":
+                                filenames.append(entry.name)
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+
+            if filenames:
+                batch.append((folder, filenames))
+            stack.extend(reversed(subfolders))
+
+            if batch and (len(batch) >= self.batchsize or time.monotonic() - last > self.interval):
+                self.signals.batch.emit(self.generation, batch)
+                batch = []
+                last = time.monotonic()
+
+        if not self._cancelled.is_set():
+            if batch:
+                self.signals.batch.emit(self.generation, batch)
+            self.signals.finished.emit(self.generation)
+
+
+def parseFilter(text):
+    """
+    splits the text of the tree filter into a part of the file name and conditions on the columns of
+    the FolderIndex, e.g. "run rows>1000 ymax<=5" -> ("run", [("rows", ">", 1000.0), ("ymax", "<=", 5.0)])
+    """
+    words = []
+    conditions = []
+    for word in text.split():
+        match = re.fullmatch(r"(\w+)(<=|>=|<|>|=)([-+.\deE]+)", word)
+        if match and match[1].lower() in TREE_COLUMNS.values():
+            with contextlib.suppress(ValueError):
+                conditions.append((match[1].lower(), match[2], float(match[3])))
+                continue
+        words.append(word)
+    return " ".join(words), conditions
+
+
+class FilenameIndex:
+    """
+    Trigram index of the file names of the scanned folders (case-insensitive substring search)
+
+    Every file gets an id in order of adding (the files of a folder are consecutive), every
+    trigram of its lower case name lists the ids of the names containing it. A search only checks
+    the names listed by the rarest trigram of the text.
+    """
+
+    def __init__(self):
+        self.names = []  # id -> lower case file name
+        self.folders = []  # id -> index of folder
+        self.starts = []  # index of folder -> id of its first file
+        self.trigrams = {}  # trigram -> ids (ascending)
+        self.ids = {}  # path -> id
+
+    def add(self, folder, filenames):
+        """
+        adds the file names of a folder, returns the index of the folder
+        a folder added again (changed files) gets a new index and new ids
+        """
+        index = len(self.starts)
+        self.starts.append(len(self.names))
+        for i, name in enumerate(filenames, len(self.names)):
+            self.ids[os.path.join(folder, name)] = i
+            name = name.lower()
+            self.names.append(name)
+            self.folders.append(index)
+            for trigram in {name[k:k + 3] for k in range(len(name) - 2)}:
+                self.trigrams.setdefault(trigram, []).append(i)
+        return index
+
+    def search(self, text):
+        """
+        returns the set of ids of the file names containing text
+        """
+        text = text.lower()
+        if len(text) < 3:
+            return {i for i, name in enumerate(self.names) if text in name}
+
+        # candidates: names with the rarest trigram of text
+        candidates = min((self.trigrams.get(text[k:k + 3], []) for k in range(len(text) - 2)), key=len)
+        if len(text) == 3:
+            return set(candidates)
+        return {i for i in candidates if text in self.names[i]}
+
+
+class PreloadJobSignals(QtCore.QObject):
+    """
+    Signals of PreloadJob
+    """
+    finished = QtCore.pyqtSignal()
+
+
+class PreloadJob(QtCore.QRunnable):
+    """
+    Imports modules in a worker thread (QThreadPool), so the window is shown before the heavy
+    imports (numpy, matplotlib) are done
+    """
+
+    def __init__(self, modules):
+        super().__init__()
+        self.modules = modules
+        self.signals = PreloadJobSignals()
+
+    def run(self):
+        for name in self.modules:
+            with TRACER.span(f"import {name}"):
+                importlib.import_module(name)
+        # the application may have been closed meanwhile (signals deleted)
+        with contextlib.suppress(RuntimeError):
+            self.signals.finished.emit()
+
+
+class LoadJobSignals(QtCore.QObject):
+    """
+    Signals of LoadJob (QRunnable cannot emit signals itself)
+    """
+    progress = QtCore.pyqtSignal(int, int, int)  # generation, done, total (1/1000 files)
+    partial = QtCore.pyqtSignal(int, object, object, object)  # generation, channellists, data, {Channel: (x, y)}
+    finished = QtCore.pyqtSignal(int, object, object)  # generation, channellists, data (Channel -> DataEntry)
+    failed = QtCore.pyqtSignal(int, str)  # generation, message
+
+
+class LoadJob(QtCore.QRunnable):
+    """
+    Loads the Channels of all subplots in a worker thread (QThreadPool)
+
+    Every file is read once for all of its channels, even if it is part of several subplots, and
+    only the columns of channels missing in the cache are parsed. The job stops between
+    two files (or two blocks of a large file) as soon as it is cancelled and does not report
+    anything afterwards. While large files are read, the progress is reported per block and
+    the data loaded so far is sent as partial result (at most every STREAM_PARTIAL_S).
+    With lod, the LODPyramids of large files are created as well (unchanged files are
+    DataEntries from the cache, which already have their pyramid).
+    """
+
+    def __init__(self, generation, channellists, delimiter, cache, parser, lod=False):
+        super().__init__()
+        self.generation = generation
+        self.channellists = channellists
+        self.delimiter = delimiter
+        self.cache = cache
+        self.parser = parser
+        self.lod = lod
+        self.signals = LoadJobSignals()
+        self._cancelled = threading.Event()
+        self._partialtime = 0
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def _streamProgress(self, index, files, data, reader, columns):
+        """
+        progress of a large file after every block (see StreamReader), the overview is sent for the
+        channels of the first x column of the file (columns: columns read by reader)
+        """
+        if self._cancelled.is_set():
+            raise RuntimeError("cancelled")
+        self.signals.progress.emit(self.generation, 1000 * index + 1000 * reader.done // reader.total,
+                                   1000 * len(files))
+
+        now = time.perf_counter()
+        if now - self._partialtime >= STREAM_PARTIAL_S:
+            self._partialtime = now
+            overview = {Channel(files[index], columns[0], y): xy for y, xy in zip(columns[1:], reader.overview())}
+            self.signals.partial.emit(self.generation, self.channellists, dict(data), overview)
+
+    def run(self):
+        channels = list(OrderedDict.fromkeys(i for channellist in self.channellists for i in channellist))
+        files = list(channelColumns(channels))
+        data = {}
+        start = time.perf_counter()
+        try:
+            for index, file in enumerate(files):
+                if self._cancelled.is_set():
+                    return
+                self.signals.progress.emit(self.generation, 1000 * index, 1000 * len(files))
+
+                def progress(reader, columns, index=index):
+                    self._streamProgress(index, files, data, reader, columns)
+
+                def parser(path, delimiter, channels):
+                    return self.parser(path, delimiter, channels, progress)
+
+                entries = self.cache.get(file, self.delimiter, [i for i in channels if i.path == file], parser)
+                data.update(entries)
+
+                for entry in entries.values():
+                    if self.lod and entry.n > LOD_MIN_POINTS and entry.pyramid is None:
+                        entry.pyramid = LODPyramid.create(entry.x, entry.y)
+        except Exception as e:
+            if not self._cancelled.is_set():
+                self.signals.failed.emit(self.generation, f"{file}: {e}")
+            return
+
+        if not self._cancelled.is_set():
+            TRACER.record("parse", start, time.perf_counter(), files=len(files))
+            self.signals.progress.emit(self.generation, 1000 * len(files), 1000 * len(files))
+            self.signals.finished.emit(self.generation, self.channellists, data)
+
+
+class ExportJobSignals(QtCore.QObject):
+    """
+    Signals of ExportJob
+    """
+    progress = QtCore.pyqtSignal(int, int)  # curves done, total
+    finished = QtCore.pyqtSignal(str)  # message
+    failed = QtCore.pyqtSignal(str)  # message
+
+
+class ExportJob(QtCore.QRunnable):
+    """
+    Exports a snapshot of the figure (see MatplotlibCanvas.snapshot) in a worker thread
+
+    The copy of the figure gets the data of its curves at output resolution: with decimate, the
+    visible range of every curve is reduced to 2 points per pixel column at dpi (simplification to
+    the output resolution). With rasterize, lines and collections with more than
+    EXPORT_RASTERIZE_POINTS points are rasterized at dpi, while text and axes stay vector.
+    """
+
+    def __init__(self, figure, curves, path, dpi=EXPORT_DPI, decimate=True, rasterize=True):
+        super().__init__()
+        self.figure = figure
+        self.curves = curves
+        self.path = path
+        self.dpi = dpi
+        self.decimate = decimate
+        self.rasterize = rasterize
+        self.signals = ExportJobSignals()
+
+    def run(self):
+        start = time.perf_counter()
+        try:
+            with TRACER.span("export", file=str(self.path)):
+                fig = pickle.loads(self.figure)
+                total = sum(len(i[3]) for i in self.curves)
+                done = 0
+                for k, kind, index, curves, sortedx, shown in self.curves:
+                    axs = fig.axes[k]
+                    x0, x1 = sorted(axs.get_xlim())
+                    npixels = max(int(axs.get_position().width * fig.get_figwidth() * self.dpi), 1)
+                    data = [exportCurve(curve, isSorted, x0, x1, npixels if self.decimate else None)
+                            for curve, isSorted in zip(curves, sortedx)]
+
+                    artist = axs.lines[index] if kind == "line" else axs.collections[index]
+                    if kind == "line":
+                        artist.set_data(*data[0])
+                    else:
+                        artist.set_segments([np.column_stack(i) for i in data])
+                    if self.rasterize and sum(len(i[0]) for i in data) > EXPORT_RASTERIZE_POINTS:
+                        artist.set_rasterized(True)
+
+                    done += len(curves)
+                    self.signals.progress.emit(done, total)
+
+                fig.savefig(self.path, dpi=self.dpi)
+        except Exception as e:
+            self.signals.failed.emit(f"Export failed: {e}")
+            return
+        self.signals.finished.emit(f"Exported {self.path} ({os.path.getsize(self.path) / 2**20:.1f} MB) "
+                                   f"in {time.perf_counter() - start:.1f} s")
+
+
+class RenderJobSignals(QtCore.QObject):
+    """
+    Defines the signals available from a running RenderJob thread
+    """
+
+    # generation, (width, height, dpi), RendererAgg or None, error message
+    finished = QtCore.pyqtSignal(int, object, object, str)
+
+
+class RenderJob(QtCore.QRunnable):
+    """
+    Renders a snapshot of the figure (see MatplotlibCanvas.snapshot) with Agg in a worker thread
+
+    The copy of the figure gets the data shown on the canvas and is drawn into an off-screen
+    buffer (RendererAgg) of width x height pixels at dpi, which the canvas paints when finished.
+    """
+
+    def __init__(self, generation, figure, curves, key):
+        super().__init__()
+        self.generation = generation
+        self.figure = figure
+        self.curves = curves
+        self.key = key
+        self.signals = RenderJobSignals()
+
+    def run(self):
+        from matplotlib.backends.backend_agg import RendererAgg
+
+        renderer = None
+        error = ""
+        try:
+            with TRACER.span("render"):
+                fig = pickle.loads(self.figure)
+                for k, kind, index, curves, sortedx, shown in self.curves:
+                    axs = fig.axes[k]
+                    if kind == "line":
+                        axs.lines[index].set_data(*shown)
+                    else:
+                        axs.collections[index].set_segments(shown)
+
+                width, height, dpi = self.key
+                fig.dpi = dpi
+                renderer = RendererAgg(width, height, dpi)
+                fig.draw(renderer)
+        except Exception as e:
+            # the canvas falls back to drawing in the GUI thread
+            error = str(e)
+            renderer = None
+        # the application may have been closed meanwhile (signals deleted)
+        with contextlib.suppress(RuntimeError):
+            self.signals.finished.emit(self.generation, self.key, renderer, error)
+
+
+def qtCanvas(cls):
+    """
+    returns the Qt canvas class of cls (MatplotlibCanvas, xkcdPlot, myPlot): cls combined with
+    FigureCanvasQTAgg, which is only imported on first use
+    """
+    canvas = QT_CANVAS_CLASSES.get(cls)
+    if canvas is None:
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
+        canvas = QT_CANVAS_CLASSES[cls] = type(cls.__name__, (cls, FigureCanvasQTAgg), {"__doc__": cls.__doc__})
+    return canvas
+
+
+def setupSubplots(fig, nsubplots):
+    """
+    removes all artists of fig and creates nsubplots stacked subplots with the current style (rcParams)
+    returns axes (nsubplots == 1) or array of axes
+
+    used by MatplotlibCanvas and renderSpec
+    """
+    fig.clear()
+    styleFigure(fig, nsubplots)
+
+    # exception handling for 1 plot (no subplots)
+    if nsubplots == 1:
+        axs = fig.subplots(1, 1)
+        axs.spines["top"].set_visible(False)
+        axs.spines["right"].set_visible(False)
+
+    else:
+        axs = fig.subplots(nsubplots, 1, sharex=True)
+        for i in range(nsubplots):
+            axs[i].spines["top"].set_visible(False)
+            axs[i].spines["right"].set_visible(False)
+
+            if i != nsubplots-1:
+                axs[i].get_xaxis().set_visible(False)
+                axs[i].spines['bottom'].set_visible(False)
+
+            # add title (for navibar)
+            if i == 0:
+                axs[i].set_title(f"{i+1}    (Top)", visible=False)
+            elif i == nsubplots-1:
+                axs[i].set_title(f"{i+1}    (Bottom)", visible=False)
+            else:
+                axs[i].set_title(i+1, visible=False)
+
+    return axs
+
+
+def styleFigure(fig, nsubplots):
+    """
+    applies colors and subplot parameters of the current style (rcParams) to fig
+
+    used by setupSubplots and MatplotlibCanvas.restyle
+    """
+    fig.set_facecolor(mpl.rcParams["figure.facecolor"])
+    fig.set_edgecolor(mpl.rcParams["figure.edgecolor"])
+    params = {i: mpl.rcParams[f"figure.subplot.{i}"] for i in ("left", "right", "bottom", "top", "wspace", "hspace")}
+    if nsubplots > 1:
+        # fig.tight_layout()
+        params["hspace"] = 0.2
+    # subplots_adjust also moves existing axes (subplotpars.update does not)
+    fig.subplots_adjust(**params)
+
+
+def themeStyle(theme):
+    """
+    resolved rcParams of a theme (defaults updated with the style), cached after first use
+    old seaborn style names are mapped to the seaborn-v0_8 styles of newer matplotlib versions
+
+    used by ApplicationWindow.Update and renderSpec
+    """
+    style = THEME_STYLES.get(theme)
+    if style is None:
+        name = theme
+        if name is not None and name.startswith("seaborn") and name not in plt.style.library:
+            name = name.replace("seaborn", "seaborn-v0_8", 1)
+        with mpl.rc_context():
+            mpl.rcParams.update({k: mpl.rcParamsDefault[k] for k in mpl.rcParamsDefault if k != "backend"})
+            if name is not None and name != "default":
+                plt.style.use(name)
+            # backend is left alone (reading it can switch the backend)
+            style = {k: mpl.rcParams[k] for k in mpl.rcParams if k != "backend"}
+        THEME_STYLES[theme] = style
+    return style
+
+
+def canRestyle(old, new):
+    """
+    True if the resolved styles old and new only differ in RESTYLE_KEYS
+    """
+    return all(key.startswith(RESTYLE_KEYS) for key in new if old.get(key) != new[key])
+
+
+def stackOffsets(n, ymax):
+    """
+    stacking offsets of the n curves of a subplot: curve i is shifted by i*0.1 in x and
+    by i/5 of the maximum of the first curve (ymax) in y
+    returns arrays (xoffsets, yoffsets)
+    """
+    i = np.arange(n)
+    return i * 0.1, i * (ymax if np.isfinite(ymax) else 0) / 5
+
+
+def curveColors(n, theme):
+    """
+    colors of n curves of a subplot
+    default theme: Bang Wong colorset, else color cycle of the current style (as if the curves
+    were plotted in reversed order)
+    """
+    if theme is None or theme == "default":
+        return [COLORS.get(i, "black") for i in range(n)]
+    cycle = mpl.rcParams["axes.prop_cycle"].by_key().get("color", ["black"])
+    return [cycle[(n - 1 - i) % len(cycle)] for i in range(n)]
+
+
+def addLegend(axs, handles):
+    """
+    adds draggable legend with handles (first curve on top), removes legend if there are no handles
+    """
+    if handles:
+        axs.legend(handles, [i.get_label() for i in handles], frameon=False).set_draggable(True)
+    elif axs.get_legend() is not None:
+        axs.get_legend().remove()
+
+
+def setLabels(fig, title, xlabel, ylabel):
+    """
+    sets title and labels of the figure
+    """
+    fig.suptitle(title, fontsize=16)
+    fig.supxlabel(xlabel)
+    fig.supylabel(ylabel)
+
+
+class MatplotlibCanvas:
+    """
+    Class to create canvas for matplotlib subplots (Qt canvas: qtCanvas(MatplotlibCanvas))
+
+    The canvas persists, setupAxes rebuilds the subplots within the same figure.
+    The figure is not managed by pyplot, so no figures are left open.
+    Without nsubplots, the subplots are created by the first setupAxes.
+
+    inspired by https://www.pythonguis.com/tutorials/plotting-matplotlib/
+    """
+
+    def __init__(self, parent=None, dpi=120, nsubplots=None):
+        from matplotlib.figure import Figure
+
+        self.fig = Figure()
+        super(MatplotlibCanvas, self).__init__(self.fig)
+        self.readout = None  # cursor readout (see enableCursorReadout)
+        self.asyncrender = False  # render in a worker thread (see requestRender)
+        self.rendergeneration = 0  # incremented by every requested render, older frames are dropped
+        self.renderjob = None
+        # own thread, so redraws never wait behind background jobs (indexing, sparklines, ...) in the global pool
+        self.renderpool = QtCore.QThreadPool()
+        self.renderpool.setMaxThreadCount(1)
+        self.frame = None  # last rendered buffer (RendererAgg)
+        self._lastKey = None  # (width, height, dpi) of self.renderer (also set by FigureCanvasAgg.get_renderer)
+        self.nsubplots = None
+        self.lines = {}
+        self.curves = {}
+        self.collections = {}
+        self.segments = {}
+        self.sortedx = {}
+        self.decimated = {}
+        self.axlist = []
+        if nsubplots is not None:
+            self.setupAxes(nsubplots)
+        self.mpl_connect("resize_event", lambda event: [self.redecimate(i) for i in self.axlist])
+
+    def setupAxes(self, nsubplots):
+        """
+        removes all artists and creates nsubplots subplots with the current style (rcParams)
+        """
+        self.nsubplots = nsubplots
+        self.lines = {}  # curves of ApplicationWindow.updateCurves (lines or legend proxies of collections)
+        self.curves = {}  # line -> (x, y, xoffset, yoffset, LODPyramid or None)
+        self.collections = {}  # axes -> (LineCollection, legend proxies of the curves)
+        self.segments = {}  # axes -> segments set on its collection (get_segments copies them)
+        self.sortedx = {}  # line -> x values of curve are sorted
+        self.decimated = {}  # axes -> (x0, x1, npixels) of the last redecimate
+
+        self.axs = setupSubplots(self.fig, nsubplots)
+        self.axlist = [self.axs] if nsubplots == 1 else list(self.axs)
+
+        if self.readout is not None:
+            # figure was cleared
+            self.enableCursorReadout(False)
+            self.enableCursorReadout(True)
+
+        for axs in self.axlist:
+            axs.callbacks.connect("xlim_changed", self.redecimate)
+
+    def draw(self):
+        """
+        draws the figure, with asyncrender in a worker thread (the last frame stays until then)
+        """
+        if self.asyncrender:
+            self.requestRender()
+            return
+        with TRACER.span("draw"):
+            super(MatplotlibCanvas, self).draw()
+
+    def renderKey(self):
+        """
+        returns size (physical pixels) and dpi of the buffer the canvas needs
+        """
+        return (*self.get_width_height(physical=True), self.fig.dpi)
+
+    def requestRender(self):
+        """
+        renders the current state of the figure in a worker thread (RenderJob)
+        only one render runs at a time: requests meanwhile start one render of the latest state when it is finished
+
+        called by draw (draw_idle and paintEvent)
+        """
+        self.rendergeneration += 1
+        if self.readout is not None and self.renderKey() != self._lastKey:
+            # no blitting of the cursor readout into a buffer of the old size
+            self.background = None
+        if self.renderjob is None:
+            self._startRender()
+
+    def _startRender(self):
+        try:
+            figure, curves = self.snapshot()
+        except Exception as e:
+            self._drawFallback(e)
+            return
+        self.renderjob = RenderJob(self.rendergeneration, figure, curves, self.renderKey())
+        self.renderjob.signals.finished.connect(self._rendered)
+        self.renderpool.start(self.renderjob)
+
+    def _rendered(self, generation, key, renderer, error):
+        """
+        shows the rendered frame, unless the figure or the canvas size has changed meanwhile (stale frame)
+        if rendering failed, the figure is drawn in the GUI thread and the error is shown in the statusbar
+
+        connected with RenderJob.signals.finished
+        """
+        self.renderjob = None
+        if generation != self.rendergeneration:
+            self._startRender()
+            return
+        if renderer is None:
+            self._drawFallback(error)
+            return
+        if key != self.renderKey():
+            return
+
+        # get_renderer of FigureCanvasAgg reuses the renderer with the same key (blitting, paintEvent)
+        self.renderer = self.frame = renderer
+        self._lastKey = key
+        if self.readout is not None:
+            self._cacheBackground(None)
+        self.update()
+
+    def _drawFallback(self, error):
+        """
+        draws the figure in the GUI thread if it could not be rendered in a worker thread,
+        the error is shown in the statusbar
+
+        called by _startRender, _rendered
+        """
+        window = self.window()
+        if isinstance(window, QtWidgets.QMainWindow):
+            window.statusBar().showMessage(f"Rendering failed: {error}")
+        self.frame = None
+        with TRACER.span("draw"):
+            super(MatplotlibCanvas, self).draw()
+
+    def paintEvent(self, event):
+        """
+        with asyncrender, the last frame is scaled to the canvas until the frame of the new size is rendered
+        """
+        if not self.asyncrender or self.frame is None or (self.renderer is self.frame
+                                                          and self._lastKey == self.renderKey()):
+            return super(MatplotlibCanvas, self).paintEvent(event)
+
+        self._draw_idle()
+        buffer = self.frame.buffer_rgba()
+        image = QtGui.QImage(buffer, buffer.shape[1], buffer.shape[0], QtGui.QImage.Format_RGBA8888)
+        painter = QtGui.QPainter(self)
+        painter.drawImage(QtCore.QRectF(self.rect()), image)
+        painter.end()
+
+    def setCurve(self, line, x, y, xoffset=0, yoffset=0, pyramid=None):
+        """
+        sets data of a curve, shifted by the stacking offsets
+        with pyramid, only the min/max envelope of the visible range is set (level of detail)
+        """
+        self.curves[line] = (x, y, xoffset, yoffset, pyramid)
+        self.sortedx[line] = pyramid is not None or bool(np.all(x[1:] >= x[:-1]))
+        if pyramid is not None:
+            # whole curve (for autoscaling), redecimate follows with xlim_changed
+            x, y = pyramid.view(None, None, max(int(line.axes.bbox.width), 1))
+        line.set_data(x + xoffset, y + yoffset)
+
+    def removeCurve(self, line):
+        self.curves.pop(line, None)
+        self.sortedx.pop(line, None)
+        if line.axes is not None:
+            # legend proxies of collections are not part of the subplot
+            line.remove()
+
+    def setCollection(self, axs, curves, colors, labels, limits):
+        """
+        sets the curves of axs as one LineCollection (first curve on top)
+        returns the legend proxies (Line2D, not added to axs) of the curves
+
+        curves: list of (x, y, xoffset, yoffset, LODPyramid or None)
+        limits: array of (xmin, xmax, ymin, ymax) of the shifted curves (see updateCollectionLimits)
+        """
+        from matplotlib.collections import LineCollection
+        from matplotlib.lines import Line2D
+
+        collection, handles, _ = self.collections.get(axs, (None, [], None))
+        if collection is None:
+            collection = LineCollection([], linewidths=mpl.rcParams["lines.linewidth"], zorder=2)
+            axs.add_collection(collection, autolim=False)
+        for handle in handles:
+            self.curves.pop(handle, None)
+            self.sortedx.pop(handle, None)
+
+        handles = []
+        for curve, color, label in zip(curves, colors, labels):
+            handle = Line2D([], [], color=color, label=label)
+            self.curves[handle] = curve
+            self.sortedx[handle] = curve[4] is not None or bool(np.all(curve[0][1:] >= curve[0][:-1]))
+            handles.append(handle)
+
+        # segments are drawn in order, the first curve is drawn last
+        collection.set_color(colors[::-1])
+        self.collections[axs] = (collection, handles, limits)
+        self._setSegments(axs, None, None)
+        return handles
+
+    def _setSegments(self, axs, x0, x1):
+        """
+        sets the segments of the collection of axs, curves with LODPyramid as min/max envelope of [x0, x1]
+        """
+        collection, handles, limits = self.collections[axs]
+        npixels = max(int(axs.bbox.width), 1)
+        segments = []
+        for handle in reversed(handles):
+            x, y, xoffset, yoffset, pyramid = self.curves[handle]
+            if pyramid is not None:
+                x, y = pyramid.view(None if x0 is None else x0 - xoffset, None if x1 is None else x1 - xoffset,
+                                    npixels)
+            segments.append(np.column_stack((x + xoffset, y + yoffset)))
+        collection.set_segments(segments)
+        self.segments[axs] = segments
+
+    def snapshot(self):
+        """
+        returns a copy of the figure without the data of the curves (pickled) and the curves:
+        [(index of axes, "line" / "collection", index of artist, curves (see setCurve), sorted x, shown data)]
+        the data of the curves is referenced, not copied (see ExportJob and RenderJob)
+        """
+        for axs in self.axlist:
+            # pending autoscaling of the view limits
+            axs.get_xlim()
+            axs.get_ylim()
+
+        curves = []
+        for k, axs in enumerate(self.fig.axes):
+            for i, line in enumerate(axs.lines):
+                if line in self.curves:
+                    curves.append((k, "line", i, [self.curves[line]], [self.sortedx[line]],
+                                   line.get_data(orig=True)))
+                    line.set_data([], [])
+            if axs in self.collections:
+                collection, handles, limits = self.collections[axs]
+                handles = handles[::-1]
+                curves.append((k, "collection", axs.collections.index(collection), [self.curves[i] for i in handles],
+                               [self.sortedx[i] for i in handles], self.segments[axs]))
+                collection.set_segments([])
+        # draggable legends hold the Qt canvas, which cannot be pickled (the copy is not interactive anyway)
+        draggables = [(i, i._draggable) for i in (axs.get_legend() for axs in self.fig.axes) if i is not None]
+        try:
+            for legend, draggable in draggables:
+                legend._draggable = None
+            figure = pickle.dumps(self.fig)
+        finally:
+            for legend, draggable in draggables:
+                legend._draggable = draggable
+            for k, kind, index, _, _, shown in curves:
+                axs = self.fig.axes[k]
+                if kind == "line":
+                    axs.lines[index].set_data(*shown)
+                else:
+                    axs.collections[index].set_segments(shown)
+        return figure, curves
+
+    def removeCollection(self, axs):
+        collection, handles, limits = self.collections.pop(axs, (None, [], None))
+        self.segments.pop(axs, None)
+        for handle in handles:
+            self.curves.pop(handle, None)
+            self.sortedx.pop(handle, None)
+        if collection is not None:
+            collection.remove()
+
+    def updateCollectionLimits(self, axs):
+        """
+        extends the data limits of axs by the limits of the curves of its collection (if any)
+
+        called by ApplicationWindow.updateCurves after relim (relim ignores collections)
+        """
+        if axs not in self.collections:
+            return None
+        limits = self.collections[axs][2]
+        corners = np.concatenate((limits[:, [0, 2]], limits[:, [1, 3]]))
+        corners = corners[np.isfinite(corners).all(axis=1)]
+        if len(corners):
+            axs.update_datalim(corners)
+
+    def setColors(self, axs, handles, colors):
+        """
+        sets the colors of the curves (lines or legend proxies) of axs and of its collection
+        """
+        for handle, color in zip(handles, colors):
+            handle.set_color(color)
+        if axs in self.collections:
+            self.collections[axs][0].set_color(colors[::-1])
+
+    def restyle(self):
+        """
+        applies the current style (rcParams) to the existing figure, subplots and curves
+        (figure, axes and tick colors, grid, spines, tick sizes, fonts, line widths)
+
+        The colors of the curves and the legends depend on the curves (see
+        ApplicationWindow.updateColors), the labels are updated by setLabels.
+        """
+        rc = mpl.rcParams
+        styleFigure(self.fig, self.nsubplots)
+        for text in self.fig.texts:
+            if self.readout is None or text is not self.readout["text"]:
+                text.set_color(rc["text.color"])
+
+        for axs in self.axlist:
+            axs.set_facecolor(rc["axes.facecolor"])
+            axs.set_axisbelow(rc["axes.axisbelow"])
+            axs.set_xmargin(rc["axes.xmargin"])
+            axs.set_ymargin(rc["axes.ymargin"])
+            for spine in axs.spines.values():
+                spine.set_edgecolor(rc["axes.edgecolor"])
+                spine.set_linewidth(rc["axes.linewidth"])
+
+            for name, axis in (("x", axs.xaxis), ("y", axs.yaxis)):
+                labelcolor = rc[f"{name}tick.labelcolor"]
+                for which in ("major", "minor"):
+                    axis.set_tick_params(which=which, direction=rc[f"{name}tick.direction"],
+                                         length=rc[f"{name}tick.{which}.size"], width=rc[f"{name}tick.{which}.width"],
+                                         pad=rc[f"{name}tick.{which}.pad"], color=rc[f"{name}tick.color"],
+                                         labelcolor=rc[f"{name}tick.color"] if labelcolor == "inherit" else labelcolor,
+                                         labelsize=rc[f"{name}tick.labelsize"])
+            axs.xaxis.set_tick_params(top=rc["xtick.top"], bottom=rc["xtick.bottom"])
+            axs.yaxis.set_tick_params(left=rc["ytick.left"], right=rc["ytick.right"])
+
+            axs.grid(False, which="both")
+            if rc["axes.grid"]:
+                axs.grid(True, which=rc["axes.grid.which"], axis=rc["axes.grid.axis"], color=rc["grid.color"],
+                         linestyle=rc["grid.linestyle"], linewidth=rc["grid.linewidth"], alpha=rc["grid.alpha"])
+
+            for line in axs.lines:
+                if line in self.curves:
+                    line.set_linewidth(rc["lines.linewidth"])
+                    line.set_solid_capstyle(rc["lines.solid_capstyle"])
+            if axs in self.collections:
+                self.collections[axs][0].set_linewidth(rc["lines.linewidth"])
+                for handle in self.collections[axs][1]:
+                    handle.set_linewidth(rc["lines.linewidth"])
+            axs.autoscale_view()
+
+    def enableCursorReadout(self, enabled):
+        """
+        shows crosshair, nearest points of all curves and values of the nearest curve while hovering
+
+        The cursor artists are animated figure artists (display coordinates, not part of the
+        subplots), they are blitted over the background cached after every draw, so moving
+        the mouse never redraws the figure.
+        """
+        if enabled and self.readout is None:
+            from matplotlib.lines import Line2D
+            from matplotlib.transforms import IdentityTransform
+
+            style = dict(animated=True, visible=False, transform=IdentityTransform())
+            self.readout = {
+                "vline": Line2D([], [], color="gray", linewidth=0.8, linestyle="--", **style),
+                "hline": Line2D([], [], color="gray", linewidth=0.8, linestyle="--", **style),
+                "points": Line2D([], [], marker="o", linestyle="none", markerfacecolor="none", color="gray", **style),
+                "text": self.fig.text(0, 0, "", fontsize=9, va="bottom", bbox=dict(boxstyle="round", fc="white",
+                                                                                   ec="gray", alpha=0.85), **style),
+            }
+            for name in ("vline", "hline", "points"):
+                self.fig.add_artist(self.readout[name])
+            self.background = None
+            self._readoutCids = [self.mpl_connect("draw_event", self._cacheBackground),
+                                 self.mpl_connect("motion_notify_event", self._moveCursor),
+                                 self.mpl_connect("axes_leave_event", lambda event: self._hideCursor())]
+            self.draw_idle()
+
+        elif not enabled and self.readout is not None:
+            for cid in self._readoutCids:
+                self.mpl_disconnect(cid)
+            for artist in self.readout.values():
+                if artist.figure is not None:
+                    artist.remove()
+            self.readout = None
+            self.background = None
+            self.draw_idle()
+
+    def _cacheBackground(self, event):
+        self.background = self.copy_from_bbox(self.fig.bbox)
+
+    def _blitCursor(self):
+        self.restore_region(self.background)
+        for artist in self.readout.values():
+            self.fig.draw_artist(artist)
+        self.blit(self.fig.bbox)
+
+    def _hideCursor(self):
+        if self.readout is None or self.background is None:
+            return None
+        for artist in self.readout.values():
+            artist.set_visible(False)
+        self._blitCursor()
+
+    def _moveCursor(self, event):
+        """
+        finds the nearest point of every curve of the hovered subplot by binary search in
+        x (minus stacking offset), the nearest of them (in pixels) is shown in the readout
+
+        connected with motion_notify_event
+        """
+        if self.background is None or event.inaxes not in self.axlist:
+            self._hideCursor()
+            return None
+
+        axs = event.inaxes
+        points = []
+        nearest = None
+        for line in list(axs.lines) + self.collections.get(axs, (None, [], None))[1]:
+            if line not in self.curves or not line.get_visible():
+                continue
+            x, y, xoffset, yoffset, pyramid = self.curves[line]
+            i = nearestIndex(x, event.xdata - xoffset, self.sortedx[line])
+            if i is None:
+                continue
+            px, py = axs.transData.transform((x[i] + xoffset, y[i] + yoffset))
+            points.append((px, py))
+            distance = np.hypot(px - event.x, py - event.y)
+            if nearest is None or distance < nearest[0]:
+                nearest = (distance, line, x[i], y[i], px, py)
+
+        if nearest is None:
+            self._hideCursor()
+            return None
+
+        distance, line, x, y, px, py = nearest
+        x0, y0, x1, y1 = axs.bbox.extents
+        self.readout["vline"].set_data([px, px], [y0, y1])
+        self.readout["hline"].set_data([x0, x1], [py, py])
+        self.readout["points"].set_data(*zip(*points))
+        self.readout["text"].set_text(f"{line.get_label()}\nx = {x:.6g}\ny = {y:.6g}")
+        self.readout["text"].set_position((px + 8, py + 8))
+        for artist in self.readout.values():
+            artist.set_clip_box(axs.bbox)
+            artist.set_visible(True)
+        self.readout["text"].set_clip_on(False)
+        self._blitCursor()
+
+    def redecimate(self, axs):
+        """
+        updates the min/max envelopes of the curves of axs and of the subplots sharing its x axis
+        (matplotlib 3.5 changes the limits of shared axes without xlim_changed)
+
+        connected with xlim_changed of the subplots and resize_event
+        """
+        for other in axs.get_shared_x_axes().get_siblings(axs):
+            # shared axes which emit xlim_changed themselves are decimated only once
+            if other is axs or self.decimated.get(other) != (*other.get_xlim(), max(int(other.bbox.width), 1)):
+                self._redecimate(other)
+
+    def _redecimate(self, axs):
+        """
+        updates the min/max envelopes of the curves of axs for the visible x range
+        """
+        x0, x1 = axs.get_xlim()
+        npixels = max(int(axs.bbox.width), 1)
+        self.decimated[axs] = (x0, x1, npixels)
+        for line in axs.lines:
+            x, y, xoffset, yoffset, pyramid = self.curves.get(line, (None, None, 0, 0, None))
+            if pyramid is not None:
+                x, y = pyramid.view(x0 - xoffset, x1 - xoffset, npixels)
+                line.set_data(x + xoffset, y + yoffset)
+
+        if axs in self.collections and any(self.curves[i][4] is not None for i in self.collections[axs][1]):
+            self._setSegments(axs, x0, x1)
+
+
+class xkcdPlot:
+    """
+    Class to create canvas for matplotlib with xkcd style (Qt canvas: qtCanvas(xkcdPlot))
+    https://matplotlib.org/stable/gallery/showcase/xkcd.html#sphx-glr-gallery-showcase-xkcd-py
+
+    Based on "Stove Ownership" from XKCD by Randall Munroe    https://xkcd.com/418/
+    """
+
+    def __init__(self, parent=None, dpi=120):
+        from matplotlib.figure import Figure
+
+        with plt.xkcd():
+
+            # not a pyplot figure, so it is freed with the canvas
+            self.fig = Figure()
+            self.ax = self.fig.add_axes((0.1, 0.2, 0.8, 0.7))
+            self.ax.spines.right.set_color('none')
+            self.ax.spines.top.set_color('none')
+            self.ax.set_xticks([])
+            self.ax.set_yticks([])
+            self.ax.set_ylim([-30, 10])
+
+            self.data = np.ones(100)
+            self.data[70:] -= np.arange(30)
+
+            self.ax.annotate(
+                'THE DAY I REALIZED\nI COULD COOK BACON\nWHENEVER I WANTED',
+                xy=(70, 1), arrowprops=dict(arrowstyle='->'), xytext=(15, -10))
+
+            self.ax.plot(self.data)
+
+            self.ax.set_xlabel('time')
+            self.ax.set_ylabel('my overall health')
+
+            # self.fig.tight_layout()
+            super(xkcdPlot, self).__init__(self.fig)
+
+
+class myPlot:
+    """
+    Nicolas favored plotting style (Qt canvas: qtCanvas(myPlot))
+
+    Adapted from https://visme.co/blog/funny-graphs/
+    """
+    def __init__(self, parent=None, dpi=120):
+        from matplotlib.figure import Figure
+
+        # not a pyplot figure, so it is freed with the canvas
+        self.fig = Figure()
+        self.ax = self.fig.add_axes((0.1, 0.1, 0.8, 0.8))
+        self.ax.axis('off')
+        self.fig.suptitle("my charts and graphs are:", size=20)
+
+        self.ax.arrow(0, 1, 0, -2, color='black', head_length=0.07, head_width=0.05, length_includes_head=True)
+        self.ax.arrow(0, -1, 0, 2, color='black', head_length=0.07, head_width=0.05, length_includes_head=True)
+        self.ax.arrow(1, 0, -2, 0, color='black', head_length=0.07, head_width=0.05, length_includes_head=True)
+        self.ax.arrow(-1, 0, 2, 0, color='black', head_length=0.07, head_width=0.05, length_includes_head=True)
+
+        self.ax.text(0.5, 1, 'Easy to comprehend', horizontalalignment='center', size=16,
+                     verticalalignment='center', transform=self.ax.transAxes)
+        self.ax.text(0.5, 0, 'Hard to comprehend', horizontalalignment='center', size=16,
+                     verticalalignment='center', transform=self.ax.transAxes)
+        self.ax.text(0, 0.5, 'Boring', horizontalalignment='center', size=16,
+                     verticalalignment='center', transform=self.ax.transAxes, rotation='vertical')
+        self.ax.text(1, 0.5, 'Fascinating', horizontalalignment='center', size=16,
+                     verticalalignment='center', transform=self.ax.transAxes, rotation=270)
+
+        self.ax.plot(0.7, 0.7, 'co', markersize=20)
+        self.ax.text(0.62, 0.76, 'My perception', size=12)
+        self.ax.plot(-0.7, -0.7, 'mo', markersize=20)
+        self.ax.text(-0.78, -0.78, 'Everyone else', size=12)
+
+        super(myPlot, self).__init__(self.fig)
+
+
+def sniffDelimiter(path, nbytes=4096):
+    """
+    detects the delimiter of a data file from its first few KB
+
+    ";" and tab are preferred over ",", as files separated by them may use the decimal comma
+    returns None (any whitespace) if no delimiter occurs consistently
+    """
+    with open(path, "rb") as f:
+        sample = f.read(nbytes).decode("latin-1")
+
+    lines = [line for line in sample.splitlines() if line.strip()]
+    if len(lines) > 2:
+        # skip header and possibly truncated last line
+        lines = lines[1:-1]
+
+    for delimiter in (";", "\t", ","):
+        counts = {line.count(delimiter) for line in lines}
+        if len(counts) == 1 and counts.pop() > 0:
+            return delimiter
+    return None
+
+
+def _isNumeric(fields):
+    try:
+        [float(i) for i in fields]
+    except ValueError:
+        return False
+    return bool(fields)
+
+
+def _dataStart(text, delimiter):
+    """
+    offset of the first numeric line of text (header lines are skipped)
+    """
+    start = 0
+    while start < len(text):
+        end = text.find("\n", start)
+        end = len(text) if end == -1 else end + 1
+        if _isNumeric(text[start:end].split(delimiter)):
+            break
+        start = end
+    return start
+
+
+def fastParse(text, delimiter):
+    """
+    parses text in one vectorized pass (np.fromstring) into an array (rows, columns)
+
+    header lines are skipped, the decimal comma is supported for non-comma delimiters
+    raises ValueError for irregular text (missing values, varying number of columns, ...)
+    """
+    raw = text
+    if delimiter != ",":
+        text = text.replace(",", ".")
+    if delimiter is not None:
+        text = text.replace(delimiter, " ")
+
+    start = _dataStart(text, None)
+    body = text[start:].strip()
+    if not body:
+        raise ValueError("no data found")
+
+    nrows = body.count("\n") + 1
+    with warnings.catch_warnings():
+        # numpy < 1.24 only warns about unparsable data
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            values = np.fromstring(body, sep=" ")
+        except DeprecationWarning as e:
+            raise ValueError(str(e)) from None
+
+    if values.size % nrows or values.size // nrows < 2:
+        raise ValueError("irregular columns")
+
+    # the number of values alone does not notice lines with too few and too many values:
+    # count the delimiters (or the values, if separated by whitespace) of every line
+    ncols = values.size // nrows
+    offset = start + len(text[start:]) - len(text[start:].lstrip())
+    if delimiter is not None and len(delimiter) == 1 and delimiter.strip():
+        chars = np.frombuffer(raw[offset:offset + len(body)].encode("latin-1", "replace"), np.uint8)
+        fields = chars == ord(delimiter)
+        expected = ncols - 1
+    else:
+        chars = np.frombuffer(body.encode("latin-1", "replace"), np.uint8)
+        space = chars <= 32
+        fields = ~space & np.concatenate([[True], space[:-1]])
+        expected = ncols
+    ends = np.append(np.flatnonzero(chars == 10), len(chars))
+    counts = np.diff(np.searchsorted(np.flatnonzero(fields), ends), prepend=0)
+    if len(counts) != nrows or np.any(counts != expected):
+        raise ValueError("irregular columns")
+
+    return values.reshape(nrows, -1)
+
+
+def projectedParse(text, delimiter, columns=(0, 1)):
+    """
+    parses only the columns of text into an array (rows, len(columns)) with np.loadtxt (usecols),
+    the other columns are split, but not converted
+
+    header lines are skipped, the decimal comma is supported for non-comma delimiters
+    raises ValueError for irregular text, missing columns and numpy < 1.23 (loadtxt without C parser)
+    """
+    if np.lib.NumpyVersion(np.__version__) < "1.23.0":
+        raise ValueError("np.loadtxt is too slow")
+    if delimiter != ",":
+        text = text.replace(",", ".")
+
+    body = text[_dataStart(text, delimiter):]
+    if not body.strip():
+        raise ValueError("no data found")
+    try:
+        return np.loadtxt(io.StringIO(body), delimiter=delimiter, usecols=columns, ndmin=2, comments=None)
+    except IndexError as e:
+        raise ValueError(str(e)) from None
+
+
+def genfromtxtParse(text, delimiter, columns=(0, 1)):
+    """
+    parses the columns of text with np.genfromtxt into an array (rows, len(columns))
+    slow, but tolerant to missing values and broken lines
+    """
+    if delimiter != ",":
+        # decimal comma
+        text = text.replace(",", ".")
+
+    lines = text.splitlines()
+    if not lines:
+        return np.empty((0, len(columns)))
+
+    start = _dataStart(text, delimiter)
+    if start == len(text):
+        # no numeric line (e.g. a block of a file with only header lines)
+        return np.empty((0, len(columns)))
+    first = text[start:].split("\n", 1)[0]
+    if len(first.split(delimiter)) <= max(columns):
+        raise ValueError(f"column {max(columns) + 1} not found")
+
+    values = np.genfromtxt(lines, delimiter=delimiter, usecols=columns, dtype=float, invalid_raise=False)
+    values = np.atleast_2d(values).reshape(-1, len(columns))
+    return values[~np.isnan(values).all(axis=1)]
+
+
+def parseColumns(text, delimiter, columns=(0, 1)):
+    """
+    parses the columns of text into an array (rows, len(columns)) with the first parser that can
+    handle the text: projectedParse, fastParse, genfromtxtParse
+
+    used for blocks of text (see StreamReader, TailReader)
+    """
+    try:
+        return projectedParse(text, delimiter, columns)
+    except ValueError:
+        pass
+    try:
+        values = fastParse(text, delimiter)
+        if values.shape[1] > max(columns):
+            return values[:, columns]
+    except ValueError:
+        pass
+    return genfromtxtParse(text, delimiter, columns)
+
+
+def _columnArrays(values, columns, path):
+    """
+    contiguous arrays of the columns of values (rows, columns)
+    """
+    if values.shape[1] <= max(columns):
+        raise ValueError(f"column {max(columns) + 1} not found in {path}")
+    return tuple(np.ascontiguousarray(values[:, i], dtype=float) for i in columns)
+
+
+def readText(path, size=None):
+    """
+    text of the first size bytes of a file (None: whole file) up to its last line break
+    a last line without line break may still be written (e.g. live tail) and is left out
+    """
+    with open(path, "rb") as f:
+        data = f.read(-1 if size is None else size)
+    return data[:data.rfind(b"\n") + 1].decode("latin-1")
+
+
+def lineEnd(path, size, blockbytes=2**16):
+    """
+    offset behind the last line break in the first size bytes of a file (bytes parsed by readText)
+    """
+    with open(path, "rb") as f:
+        end = size
+        while end > 0:
+            start = max(end - blockbytes, 0)
+            f.seek(start)
+            cut = f.read(end - start).rfind(b"\n")
+            if cut != -1:
+                return start + cut + 1
+            end = start
+    return 0
+
+
+def projectedEngine(path, delimiter, columns=(0, 1), size=None):
+    """
+    parses only the columns of the file with projectedParse
+    """
+    text = readText(path, size)
+
+    try:
+        values = projectedParse(text, delimiter, columns)
+    except ValueError as e:
+        raise ValueError(f"{e} in {path}") from None
+    return _columnArrays(values, range(len(columns)), path)
+
+
+def fastEngine(path, delimiter, columns=(0, 1), size=None):
+    """
+    parses the whole file with fastParse
+    """
+    text = readText(path, size)
+
+    try:
+        values = fastParse(text, delimiter)
+    except ValueError as e:
+        raise ValueError(f"{e} in {path}") from None
+    return _columnArrays(values, columns, path)
+
+
+def genfromtxtEngine(path, delimiter, columns=(0, 1), size=None):
+    """
+    parses the whole file with genfromtxtParse
+    """
+    text = readText(path, size)
+
+    values = genfromtxtParse(text, delimiter, columns)
+    return _columnArrays(values, range(len(columns)), path)
+
+
+def readColumns(path, delimiter=None, nbytes=4096):
+    """
+    header metadata of a data file from its first few KB:
+    {"delimiter": detected delimiter, "columns": number of columns, "names": names of the columns}
+    the names are taken from the last header line (column numbers if there is no header)
+    """
+    with open(path, "rb") as f:
+        sample = f.read(nbytes).decode("latin-1")
+    if delimiter is None:
+        delimiter = sniffDelimiter(path)
+
+    header = []
+    ncolumns = 0
+    for line in sample.splitlines():
+        fields = [i.strip() for i in line.split(delimiter)]
+        if _isNumeric([i.replace(",", ".") if delimiter != "," else i for i in fields]):
+            ncolumns = len(fields)
+            break
+        if line.strip():
+            header = fields
+
+    names = [header[i] if i < len(header) and header[i] else f"column {i + 1}" for i in range(ncolumns)]
+    return {"delimiter": delimiter, "columns": ncolumns, "names": names}
+
+
+class ColumnIndex:
+    """
+    Header metadata of data files (see readColumns), read once per version (size, mtime) of a file
+
+    The metadata is kept in a JSON file (e.g. in the disk cache folder), so the column picker
+    opens without reading the files, also after a restart. The file is read on first use and
+    written by save.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._entries = None
+        self._changed = False
+        self._lock = threading.Lock()  # used from LoadJob worker threads
+
+    def _load(self):
+        if self._entries is None:
+            try:
+                self._entries = json.loads(self.path.read_text())
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def get(self, path, delimiter=None):
+        """
+        returns metadata of path (see readColumns), the file is only read if it is new or changed
+        """
+        stat = os.stat(path)
+        key = json.dumps([str(Path(path).resolve()), delimiter])
+        with self._lock:
+            info = self._load().get(key)
+        if info is not None and info["source"] == [stat.st_size, stat.st_mtime_ns]:
+            return info
+
+        info = dict(readColumns(path, delimiter), source=[stat.st_size, stat.st_mtime_ns])
+        with self._lock:
+            self._entries[key] = info
+            self._changed = True
+        return info
+
+    def save(self):
+        """
+        writes the metadata (entries of deleted files are dropped)
+        """
+        with self._lock:
+            if not self._changed:
+                return None
+            self._entries = {key: info for key, info in self._entries.items() if os.path.exists(json.loads(key)[0])}
+            self._changed = False
+            entries = json.dumps(self._entries)
+        with contextlib.suppress(OSError):
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            temp.write_text(entries)
+            os.replace(temp, self.path)
+
+
+# metadata of a data file in the FolderIndex (n, xmin, xmax, ymin, ymax like CurveStats)
+FileInfo = namedtuple("FileInfo", ["size", "mtime", "delimiter", "n", "xmin", "xmax", "ymin", "ymax"])
+
+
+class FolderIndex:
+    """
+    SQLite index of the .csv files of a root folder: size, mtime, detected delimiter, number of
+    rows and data range of the first two columns of every file
+
+    There is one database per root folder (named by the hash of its path). All rows are loaded
+    into files by open, so the tree of a known folder is shown before scanning and the stats are
+    looked up without queries (also from LoadJob worker threads). Only the GUI thread writes.
+    """
+
+    def __init__(self, root, folder=FOLDER_INDEX_FOLDER):
+        self.root = str(root)
+        self.path = Path(folder, f"{hashlib.sha1(self.root.encode()).hexdigest()[:16]}.sqlite")
+        self.files = {}  # path -> FileInfo (None values until indexed)
+        self.error = None  # message if the database cannot be used (the index is then kept in memory only)
+        self._db = None
+
+    def open(self):
+        """
+        opens (creates) the database and loads all rows
+        returns {folder: [file names]} of the known files
+        """
+        import sqlite3
+
+        folders = OrderedDict()
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(self.path)
+            self._db.execute("CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, folder TEXT, name TEXT, "
+                             "size INTEGER, mtime INTEGER, delimiter TEXT, rows INTEGER, "
+                             "xmin REAL, xmax REAL, ymin REAL, ymax REAL)")
+            rows = self._db.execute("SELECT path, folder, name, size, mtime, delimiter, rows, xmin, xmax, ymin, ymax "
+                                    "FROM files ORDER BY folder, name").fetchall()
+        except sqlite3.Error as e:
+            self.error = f"Folder index {self.path}: {e}"
+            self._db = None
+            return folders
+
+        for path, folder, name, *values in rows:
+            self.files[path] = FileInfo(*values)
+            folders.setdefault(folder, []).append(name)
+        return folders
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def stale(self, path, stat):
+        """
+        True if path is not indexed or has changed since
+        """
+        info = self.files.get(str(path))
+        return info is None or (info.size, info.mtime) != (stat.st_size, stat.st_mtime_ns)
+
+    def stats(self, path, delimiter=None):
+        """
+        returns the FileInfo of path if it is up to date and was parsed with delimiter (None: detected), else None
+        """
+        info = self.files.get(str(path))
+        if info is None or None in info[3:] or delimiter not in (None, info.delimiter):
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return info if (info.size, info.mtime) == (stat.st_size, stat.st_mtime_ns) else None
+
+    def setFiles(self, folders):
+        """
+        adds the files found by scanning ({folder: [file names]}) and removes files that are gone
+        new files are indexed later (update)
+        """
+        paths = {os.path.join(folder, name): (folder, name) for folder, names in folders.items() for name in names}
+        removed = [path for path in self.files if path not in paths]
+        added = [(path, *paths[path]) for path in paths if path not in self.files]
+        for path in removed:
+            del self.files[path]
+        self.files.update((path, FileInfo(*[None] * len(FileInfo._fields))) for path, folder, name in added)
+        if self._db is not None:
+            with self._db:
+                self._db.executemany("DELETE FROM files WHERE path = ?", [(path,) for path in removed])
+                self._db.executemany("INSERT OR IGNORE INTO files (path, folder, name) VALUES (?, ?, ?)", added)
+
+    def update(self, records):
+        """
+        stores the metadata of files: [(path, FileInfo), ...] (see IndexJob)
+        """
+        self.files.update(records)
+        if self._db is not None:
+            with self._db:
+                self._db.executemany("UPDATE files SET size = ?, mtime = ?, delimiter = ?, rows = ?, xmin = ?, "
+                                     "xmax = ?, ymin = ?, ymax = ? WHERE path = ?",
+                                     [(*info, path) for path, info in records])
+
+    def query(self, conditions):
+        """
+        returns the set of paths matching all conditions [(column, operator, value)]
+        column: see TREE_COLUMNS, operator: <, <=, =, >=, >
+        """
+        if self._db is None:
+            return set()
+        where = " AND ".join(f"{column} {operator} ?" for column, operator, value in conditions)
+        return {path for path, in self._db.execute(f"SELECT path FROM files WHERE {where}",
+                                                   [value for column, operator, value in conditions])}
+
+
+class IndexJobSignals(QtCore.QObject):
+    """
+    Signals of IndexJob
+    """
+    batch = QtCore.pyqtSignal(int, object)  # generation, [(path, FileInfo), ...]
+    finished = QtCore.pyqtSignal(int)  # generation
+
+
+class IndexJob(QtCore.QRunnable):
+    """
+    Parses the new and changed files of a FolderIndex in a worker thread (stale files, compared by
+    size and mtime) and reports their metadata in batches (at most every interval seconds)
+
+    Files that cannot be parsed are stored without rows, so they are only tried again when they change.
+    """
+
+    def __init__(self, generation, index, loader, interval=0.5):
+        super().__init__()
+        self.generation = generation
+        self.paths = list(index.files)
+        self.index = index
+        self.loader = loader
+        self.interval = interval
+        self.signals = IndexJobSignals()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def run(self):
+        batch = []
+        last = time.monotonic()
+        for path in self.paths:
+            if self._cancelled.is_set():
+                return None
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if not self.index.stale(path, stat):
+                continue
+
+            try:
+                with TRACER.span("index file", file=path):
+                    delimiter = sniffDelimiter(path)
+                    x, y = self.loader.load(path, delimiter)
+                    stats = CurveStats(x, y)
+                values = [stats.n] + [None if np.isnan(i) else float(i)
+                                      for i in (stats.xmin, stats.xmax, stats.ymin, stats.ymax)]
+            except Exception:
+                delimiter = None
+                values = [None] * 5
+            batch.append((path, FileInfo(stat.st_size, stat.st_mtime_ns, delimiter, *values)))
+            # the GUI thread gets the GIL between two files
+            time.sleep(0)
+
+            if time.monotonic() - last > self.interval:
+                self._emit(batch)
+                batch = []
+                last = time.monotonic()
+
+        self._emit(batch)
+        with contextlib.suppress(RuntimeError):
+            self.signals.finished.emit(self.generation)
+
+    def _emit(self, batch):
+        # the application may have been closed meanwhile (signals deleted)
+        with contextlib.suppress(RuntimeError):
+            if batch:
+                self.signals.batch.emit(self.generation, batch)
+
+
+def sparkline(path, delimiter=None, npoints=SPARKLINE_POINTS, blockbytes=SPARKLINE_BLOCK_BYTES):
+    """
+    returns a preview of the second column of a data file: array (npoints, 2) of min and max of npoints bins
+    (fewer rows for short files, NaN for bins which cannot be parsed)
+
+    Files of up to npoints blocks are parsed completely. Of larger files, only the complete lines of
+    npoints blocks of blockbytes at evenly spaced offsets are read (heavily downsampled pass).
+    """
+    if delimiter is None:
+        delimiter = sniffDelimiter(path)
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        start = _dataStart(f.read(blockbytes).decode("latin-1"), delimiter)
+        if size - start <= npoints * blockbytes:
+            f.seek(start)
+            y = parseColumns(f.read().decode("latin-1"), delimiter, (1,))[:, 0]
+            if len(y) <= npoints:
+                return np.column_stack((y, y))
+            bins = np.linspace(0, len(y), npoints + 1).astype(int)[:-1]
+            return np.column_stack((np.minimum.reduceat(y, bins), np.maximum.reduceat(y, bins)))
+
+        blocks = []
+        for offset in np.linspace(start, size - blockbytes, npoints).astype(int):
+            f.seek(offset)
+            block = f.read(blockbytes).decode("latin-1")
+            # complete lines only
+            blocks.append(block[block.find("\n") + 1 if offset > start else 0:block.rfind("\n") + 1])
+
+    preview = np.full((npoints, 2), np.nan)
+    for i, block in enumerate(blocks):
+        with contextlib.suppress(ValueError, IndexError):
+            y = parseColumns(block, delimiter, (1,))[:, 0]
+            preview[i] = np.nanmin(y), np.nanmax(y)
+    return preview
+
+
+def sparklineIcon(preview, size=SPARKLINE_SIZE, color=Qt.black):
+    """
+    draws a sparkline preview (see sparkline) as band between min and max into a transparent icon of size (pixels)
+    """
+    width, height = size
+    pixmap = QtGui.QPixmap(width, height)
+    pixmap.fill(Qt.transparent)
+    valid = np.isfinite(preview).all(axis=1)
+    if not valid.any():
+        return QtGui.QIcon(pixmap)
+
+    x = np.linspace(0.5, width - 0.5, len(preview))[valid]
+    ymin, ymax = preview[valid].T
+    low, high = ymin.min(), ymax.max()
+    scale = (height - 3) / (high - low) if high > low else 0
+    # upper edge from left to right, lower edge back
+    points = [QtCore.QPointF(i, height - 1.5 - (j - low) * scale) for i, j in zip(x, ymax)]
+    points += [QtCore.QPointF(i, height - 1.5 - (j - low) * scale) for i, j in zip(x[::-1], ymin[::-1])]
+
+    painter = QtGui.QPainter(pixmap)
+    painter.setRenderHint(QtGui.QPainter.Antialiasing)
+    painter.setPen(QtGui.QPen(QtGui.QColor(color), 1))
+    painter.setBrush(QtGui.QColor(color))
+    painter.drawPolygon(QtGui.QPolygonF(points))
+    painter.end()
+    return QtGui.QIcon(pixmap)
+
+
+class SparklineCache:
+    """
+    Disk cache of the sparkline previews of data files (see sparkline), keyed by path and mtime
+
+    The previews are kept in a SQLite database, which is opened on first use. Only the GUI thread
+    reads and writes (only the previews of the visible items are looked up).
+    """
+
+    def __init__(self, path=SPARKLINE_CACHE_FILE):
+        self.path = Path(path)
+        self.error = None  # message of the last failed read or write, until it is shown
+        self._db = None
+
+    def _connect(self):
+        import sqlite3
+
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(self.path)
+            self._db.execute("CREATE TABLE IF NOT EXISTS sparklines (path TEXT PRIMARY KEY, mtime INTEGER, "
+                             "data BLOB)")
+        return self._db
+
+    def get(self, files):
+        """
+        returns {path: preview} of the cached previews of files {path: mtime}
+        """
+        import sqlite3
+
+        previews = {}
+        paths = list(files)
+        try:
+            for i in range(0, len(paths), 500):
+                chunk = paths[i:i + 500]
+                query = f"SELECT path, mtime, data FROM sparklines WHERE path IN ({', '.join('?' * len(chunk))})"
+                for path, mtime, data in self._connect().execute(query, chunk):
+                    if files[path] == mtime:
+                        previews[path] = np.frombuffer(data).reshape(-1, 2)
+        except (OSError, sqlite3.Error) as e:
+            self.error = f"Sparkline cache {self.path}: {e}"
+        return previews
+
+    def put(self, records):
+        """
+        stores the previews [(path, mtime, preview), ...]
+        """
+        import sqlite3
+
+        rows = [(path, mtime, np.asarray(preview, float).tobytes()) for path, mtime, preview in records]
+        try:
+            with self._connect() as db:
+                db.executemany("INSERT OR REPLACE INTO sparklines (path, mtime, data) VALUES (?, ?, ?)", rows)
+        except (OSError, sqlite3.Error) as e:
+            self.error = f"Sparkline cache {self.path}: {e}"
+
+
+class SparklineJobSignals(QtCore.QObject):
+    """
+    Signals of SparklineJob
+    """
+    batch = QtCore.pyqtSignal(object)  # [(path, mtime, preview), ...]
+    finished = QtCore.pyqtSignal(int)  # generation
+
+
+class SparklineJob(QtCore.QRunnable):
+    """
+    Computes the sparkline previews of files [(path, mtime), ...] in a worker thread and reports them
+    in batches (at most every interval seconds). The job stops as soon as it is cancelled.
+
+    Files which cannot be read get an empty preview, so they are not tried again until they change.
+    """
+
+    def __init__(self, generation, files, delimiter=None, interval=0.1):
+        super().__init__()
+        self.generation = generation
+        self.files = files
+        self.delimiter = delimiter
+        self.interval = interval
+        self.signals = SparklineJobSignals()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def run(self):
+        batch = []
+        last = time.monotonic()
+        for path, mtime in self.files:
+            if self._cancelled.is_set():
+                break
+            try:
+                with TRACER.span("sparkline", file=path):
+                    preview = sparkline(path, self.delimiter)
+            except Exception:
+                preview = np.empty((0, 2))
+            batch.append((path, mtime, preview))
+            # the GUI thread gets the GIL between two files
+            time.sleep(0)
+
+            if time.monotonic() - last > self.interval:
+                self._emit(batch)
+                batch = []
+                last = time.monotonic()
+
+        self._emit(batch)
+        with contextlib.suppress(RuntimeError):
+            self.signals.finished.emit(self.generation)
+
+    def _emit(self, batch):
+        # the application may have been closed meanwhile (signals deleted)
+        with contextlib.suppress(RuntimeError):
+            if batch:
+                self.signals.batch.emit(batch)
+
+
+class StreamReader:
+    """
+    Reads a large data file in blocks of chunkbytes, so the memory used for parsing is bounded
+    by the block size instead of the file size
+
+    Every block is cut at its last line break and only the requested columns are parsed
+    (parseColumns). The rows are written into arrays preallocated from the size of the file
+    and the rows of the first block, and a min/max overview of every block (overviewpoints) is
+    collected as it goes. progress(reader) is called after every block (done / total bytes,
+    overview of the rows read so far); an exception raised by progress stops reading.
+    """
+
+    def __init__(self, chunkbytes=STREAM_CHUNK_MB * 2**20, overviewpoints=STREAM_OVERVIEW_POINTS):
+        self.chunkbytes = chunkbytes
+        self.overviewpoints = overviewpoints
+        self.done = 0
+        self.total = 0
+        self._overview = []
+
+    def overview(self):
+        """
+        min/max envelopes (x, y) of the rows read so far, one per y column
+        """
+        return [(np.concatenate([i[0] for i in blocks]), np.concatenate([i[1] for i in blocks]))
+                for blocks in self._overview]
+
+    def read(self, path, delimiter, progress=None, columns=(0, 1), size=None):
+        """
+        returns arrays of the columns (x, y1, y2, ...) of the first size bytes of path (None: whole file)
+        a last line without line break is left out (see readText)
+        """
+        self.total = os.path.getsize(path) if size is None else size
+        self.done = 0
+        self._overview = [[] for i in columns[1:]]
+        arrays = None
+        n = 0
+        rest = b""
+
+        with open(path, "rb") as f:
+            while True:
+                block = f.read(min(self.chunkbytes, self.total - f.tell()))
+                text = rest + block
+                if block:
+                    # incomplete last line is parsed with the next block
+                    cut = text.rfind(b"\n") + 1
+                    text, rest = text[:cut], text[cut:]
+                else:
+                    # last line without line break (may still be written)
+                    text = b""
+                self.done += len(text)
+
+                if text.strip():
+                    values = parseColumns(text.decode("latin-1"), delimiter, columns)
+                else:
+                    values = np.empty((0, len(columns)))
+                if len(values):
+                    if arrays is None:
+                        capacity = int(1.05 * len(values) * self.total / len(text)) + 1024
+                        arrays = [np.empty(capacity) for i in columns]
+                    elif n + len(values) > len(arrays[0]):
+                        capacity = max(int(1.25 * len(arrays[0])), n + len(values))
+                        for array in arrays:
+                            array.resize(capacity, refcheck=False)
+                    for i, array in enumerate(arrays):
+                        array[n:n + len(values)] = values[:, i]
+                    n += len(values)
+
+                    x = arrays[0][n - len(values):n]
+                    for i, blocks in enumerate(self._overview):
+                        overview = minmaxDecimate(x, arrays[i + 1][n - len(values):n], self.overviewpoints // 2)
+                        # copy, views of the arrays become invalid when they are resized
+                        blocks.append((np.array(overview[0]), np.array(overview[1])))
+                    del x
+                    if progress is not None:
+                        progress(self)
+
+                if not block:
+                    break
+
+        if arrays is None:
+            raise ValueError(f"no data found in {path}")
+        for array in arrays:
+            array.resize(n, refcheck=False)
+        return tuple(arrays)
+
+
+class CSVLoader:
+    """
+    Loads columns of data files into float arrays (x, y1, y2, ...), default: first two columns
+
+    The engines are tried in order, the first engine which can parse a file wins.
+    Further engines can be added to CSVLoader.engines: engine(path, delimiter, columns, size) -> arrays
+    of the columns of the first size bytes (None: whole file, see readText), raising ValueError if the
+    file cannot be parsed.
+    Files of at least streambytes are read in blocks by the StreamReader instead.
+    """
+
+    engines = OrderedDict([("projected", projectedEngine), ("fast", fastEngine), ("genfromtxt", genfromtxtEngine)])
+
+    def __init__(self, engines=None, streambytes=STREAM_MIN_MB * 2**20):
+        self.engines = OrderedDict((i, CSVLoader.engines[i]) for i in engines) if engines else CSVLoader.engines
+        self.streambytes = streambytes
+
+    def load(self, path, delimiter=None, progress=None, columns=(0, 1), size=None):
+        """
+        returns arrays of the columns (x, y1, y2, ...) of path, only these columns are parsed
+        delimiter None: detect delimiter of the file
+        progress: see StreamReader (large files only)
+        size: bytes of the file to parse (None: whole file), a last line without line break is left out
+        """
+        columns = tuple(columns)
+        with TRACER.span("parse file", file=str(path)):
+            if delimiter is None:
+                delimiter = sniffDelimiter(path)
+
+            if (os.path.getsize(path) if size is None else size) >= self.streambytes:
+                return StreamReader().read(path, delimiter, progress, columns, size)
+
+            error = None
+            for engine in self.engines.values():
+                try:
+                    return engine(path, delimiter, columns, size)
+                except ValueError as e:
+                    error = e
+            raise error
+
+
+def _nbytes(data):
+    """
+    memory of an array, a tuple of arrays or a DataEntry
+    """
+    if isinstance(data, tuple):
+        return sum(i.nbytes for i in data)
+    return data.nbytes
+
+
+class DataCache:
+    """
+    LRU cache for parsed data files
+
+    Entries are keyed by (path, size, mtime, delimiter, (x column, y column)), so a column of a
+    file is only parsed again if it is new or the file has changed on disk. The least recently
+    used entries are evicted as soon as the memory budget (maxbytes) is exceeded.
+    """
+
+    def __init__(self, maxbytes=CACHE_BUDGET_MB * 2**20):
+        self.maxbytes = maxbytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._keys = {}  # path -> keys of the current version of a file, to drop outdated versions
+        self._lock = threading.RLock()  # used from LoadJob worker threads
+
+    @staticmethod
+    def key(path, delimiter, columns=(0, 1)):
+        """
+        cache key of the columns (x, y) of a file, changes whenever the file is modified
+        """
+        stat = os.stat(path)
+        return str(Path(path).resolve()), stat.st_size, stat.st_mtime_ns, delimiter, tuple(columns)
+
+    def get(self, path, delimiter, channels, parser):
+        """
+        returns the parsed data of the Channels of path {channel: data},
+        parser(path, delimiter, missing channels) -> {channel: data} is only called on a cache miss
+        """
+        keys = {channel: self.key(path, delimiter, channel[1:]) for channel in channels}
+        data = {}
+        with self._lock:
+            for channel, key in keys.items():
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    data[channel] = self._entries[key]
+            self.hits += len(data)
+            self.misses += len(keys) - len(data)
+
+        missing = [i for i in channels if i not in data]
+        if missing:
+            parsed = parser(path, delimiter, missing)
+            for channel in missing:
+                self.put(keys[channel], parsed[channel])
+            data.update(parsed)
+        return data
+
+    def put(self, key, data):
+        """
+        adds data to the cache and evicts least recently used entries if over budget
+        """
+        with self._lock:
+            self._put(key, data)
+
+    def _put(self, key, data):
+        for outdated in [i for i in self._keys.get(key[0], ()) if i[1:3] != key[1:3]]:
+            self._remove(outdated)
+
+        if key in self._entries:
+            self._remove(key)
+
+        nbytes = _nbytes(data)
+        if nbytes > self.maxbytes:
+            return
+
+        self._entries[key] = data
+        self._keys.setdefault(key[0], set()).add(key)
+        self.nbytes += nbytes
+        self._evict()
+
+    def drop(self, path):
+        """
+        removes all entries of a file
+        """
+        with self._lock:
+            for key in list(self._keys.get(str(Path(path).resolve()), ())):
+                self._remove(key)
+
+    def resize(self, maxbytes):
+        """
+        changes the memory budget
+        """
+        with self._lock:
+            self.maxbytes = maxbytes
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys.clear()
+            self.nbytes = 0
+
+    def summary(self):
+        """
+        short description for the statusbar
+        """
+        return (f"Cache: {self.hits} hits, {self.misses} misses, {len(self._entries)} curves, "
+                f"{self.nbytes / 2**20:.1f} / {self.maxbytes / 2**20:.0f} MB")
+
+    def _evict(self):
+        while self.nbytes > self.maxbytes and self._entries:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key):
+        data = self._entries.pop(key, None)
+        if data is not None:
+            self.nbytes -= _nbytes(data)
+        keys = self._keys.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys[key[0]]
+
+
+def loadSpecs(inputs, template):
+    """
+    creates layout specs from spec files (.json, one spec or a list of specs) and folders
+
+    a folder is plotted as one subplot with all its .csv files (sorted by name)
+    paths of spec files are relative to the spec file; template provides default values
+    """
+    specs = []
+    for i in inputs:
+        i = Path(i)
+        if i.is_dir():
+            spec = dict(template, subplots=[[str(j) for j in sorted(i.glob("*.csv"))]])
+            spec.setdefault("output", i.name)
+            specs.append(spec)
+            continue
+
+        content = json.loads(i.read_text())
+        for spec in content if isinstance(content, list) else [content]:
+            spec = dict(template, **spec)
+            spec["subplots"] = [[str(i.parent / j) for j in filelist] for filelist in spec["subplots"]]
+            spec.setdefault("output", i.stem)
+            specs.append(spec)
+    return specs
+
+
+def renderSpec(spec):
+    """
+    renders a layout spec headless (Agg) with the stacking, colors and legends of the GUI
+
+    spec: {"subplots": [[file, ...], ...], "title", "xlabel", "ylabel", "theme", "delimiter",
+           "output" (without suffix), "outdir", "formats": ["png", "svg", "pdf"], "dpi"}
+    returns (written files, timings in s)
+    """
+    timings = {}
+    start = time.perf_counter()
+
+    loader = CSVLoader()
+    data = [[loader.load(i, spec.get("delimiter")) for i in filelist] for filelist in spec["subplots"]]
+    timings["load"] = time.perf_counter() - start
+
+    from matplotlib.figure import Figure
+
+    theme = spec.get("theme", "default")
+    with mpl.rc_context(themeStyle(theme)):
+        fig = Figure()
+        axs = setupSubplots(fig, len(data))
+        axlist = [axs] if len(data) == 1 else list(axs)
+
+        for j, axs in enumerate(axlist):
+            xoffsets, yoffsets = stackOffsets(len(data[j]), CurveStats(*data[j][0]).ymax if data[j] else 0)
+            colors = curveColors(len(data[j]), theme)
+            handles = []
+            for i, (x, y) in enumerate(data[j]):
+                line, = axs.plot(x + xoffsets[i], y + yoffsets[i], color=colors[i],
+                                 label=Path(spec["subplots"][j][i]).stem)
+                line.set_zorder(2 - 0.5 * i / len(data[j]))
+                handles.append(line)
+            addLegend(axs, handles)
+
+        setLabels(fig, spec.get("title", "Title"), spec.get("xlabel", "x-axis label"),
+                  spec.get("ylabel", "y-axis label"))
+        timings["plot"] = time.perf_counter() - start - timings["load"]
+
+        output = Path(spec.get("outdir", "."), spec["output"])
+        output.parent.mkdir(parents=True, exist_ok=True)
+        files = []
+        for fmt in spec.get("formats", ["png"]):
+            files.append(str(output.with_name(f"{output.name}.{fmt}")))
+            fig.savefig(files[-1], dpi=spec.get("dpi", "figure"))
+
+    timings["save"] = time.perf_counter() - start - timings["load"] - timings["plot"]
+    timings["total"] = time.perf_counter() - start
+    return files, timings
+
+
+def batch(args):
+    """
+    renders all specs / folders of args.batch in a process pool (headless, no Qt window)
+    """
+    mpl.use("Agg")
+
+    template = {"formats": args.formats.split(","), "theme": args.theme, "delimiter": args.delimiter}
+    template.update({i: getattr(args, i) for i in ("title", "xlabel", "ylabel", "outdir", "dpi")
+                     if getattr(args, i) is not None})
+    specs = loadSpecs(args.batch, template)
+
+    start = time.perf_counter()
+    failed = 0
+    with concurrent.futures.ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        futures = {pool.submit(renderSpec, spec): spec for spec in specs}
+        for future in concurrent.futures.as_completed(futures):
+            spec = futures[future]
+            try:
+                files, timings = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"FAILED {spec['output']}: {e}", file=sys.stderr)
+                continue
+            print(f"{', '.join(files)}: " + ", ".join(f"{i} {t * 1000:.0f} ms" for i, t in timings.items()))
+
+    print(f"{len(specs) - failed} / {len(specs)} figures in {time.perf_counter() - start:.1f} s "
+          f"({args.jobs or os.cpu_count()} processes)")
+    return 1 if failed else 0
+
+
+def parseArguments(argv):
+    """
+    command line arguments, unknown arguments are passed to Qt
+    """
+    parser = argparse.ArgumentParser(description="Plotting GUI for stacked data files. "
+                                                 "With --batch, figures are rendered without GUI.")
+    parser.add_argument("--batch", nargs="+", metavar="SPEC_OR_FOLDER",
+                        help="render layout specs (.json) or folders (all .csv files in one subplot) headless")
+    parser.add_argument("--jobs", type=int, default=None, help="number of processes (default: all cores)")
+    parser.add_argument("--formats", default="png", help="comma separated output formats, e.g. png,svg,pdf")
+    parser.add_argument("--outdir", help="output directory")
+    parser.add_argument("--theme", default="default", help="matplotlib style")
+    parser.add_argument("--delimiter", default=None, help="delimiter (default: detect)")
+    parser.add_argument("--dpi", type=float, default=None, help="resolution of raster formats")
+    parser.add_argument("--title")
+    parser.add_argument("--xlabel")
+    parser.add_argument("--ylabel")
+    parser.add_argument("--session", help="open a session file (see Menu>Save session)")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print import and init times of the GUI until the plot canvas is ready")
+    return parser.parse_known_args(argv)
 
 
 if __name__ == "__main__":
-    app = QtWidgets.QApplication(sys.argv)
-    view = ApplicationWindow()
+    args, qtargs = parseArguments(sys.argv[1:])
+    if args.batch:
+        sys.exit(batch(args))
+
+    if args.profile_startup:
+        TRACER.startRecording()
+        TRACER.record("imports", STARTUP, IMPORTED)
+
+    app = QtWidgets.QApplication(sys.argv[:1] + qtargs)
+    view = ApplicationWindow(profilestartup=args.profile_startup)
+    if args.session:
+        view.openSession(args.session)
     sys.exit(app.exec_())
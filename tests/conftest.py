@@ -0,0 +1,15 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def pg():
+    """
+    the plotting-gui.py module (the file name is not importable)
+    """
+    spec = importlib.util.spec_from_file_location("plotting_gui", Path(__file__).parents[1] / "plotting-gui.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
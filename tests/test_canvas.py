@@ -0,0 +1,21 @@
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+
+def test_redecimate_shared_subplots(pg):
+    # zooming one subplot updates the envelopes of all subplots sharing its x axis
+    canvas = type("Canvas", (pg.MatplotlibCanvas, FigureCanvasAgg), {})(nsubplots=3)
+    x = np.linspace(0, 100, 200001)
+    y = np.sin(x)
+    for axs in canvas.axlist:
+        line, = axs.plot([], [])
+        canvas.setCurve(line, x, y, pyramid=pg.LODPyramid.create(x, y))
+
+    # matplotlib 3.5 sets the limits of shared axes without xlim_changed
+    for axs in canvas.axlist:
+        axs.set_xlim(10, 11, emit=False)
+    canvas.redecimate(canvas.axlist[0])
+
+    for axs in canvas.axlist:
+        xdata = axs.lines[0].get_xdata()
+        assert xdata.min() >= 9 and xdata.max() <= 12
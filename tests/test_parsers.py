@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize("delimiter", [",", ";", None])
+def test_fastParse_ragged(pg, delimiter):
+    # the same number of values in irregular lines must not be realigned into rows
+    text = "1,2\n3\n4,5,6\n"
+    if delimiter != ",":
+        text = text.replace(",", delimiter or " ")
+    with pytest.raises(ValueError):
+        pg.fastParse(text, delimiter)
+
+
+@pytest.mark.filterwarnings("ignore:Some errors were detected")
+def test_ragged_file(pg, tmp_path):
+    # the robust parser takes over, the broken line is dropped
+    path = tmp_path / "ragged.csv"
+    path.write_text("x,y\n1,2\n3\n4,5,6\n7,8\n")
+    x, y = pg.CSVLoader(engines=["fast", "genfromtxt"]).load(path, ",")
+    assert x.tolist() == [1, 4, 7] and y.tolist() == [2, 5, 8]
+
+
+def test_fastParse_regular(pg):
+    values = pg.fastParse("t;v\n1;2,5\n3;4,5\n", ";")
+    np.testing.assert_array_equal(values, [[1, 2.5], [3, 4.5]])